@@ -1,6 +1,4 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
 from datetime import datetime
 import sys
 from pathlib import Path
@@ -10,19 +8,16 @@ import traceback
 project_path = Path(__file__).parent
 sys.path.insert(0, str(project_path))
 
-from database import init_db, save_transcript, save_score, get_all_transcripts, get_statistics
-from content_scoring import score_content_structure
-from speech_rate_scoring import score_speech_rate
-from language_grammar_scoring import score_language_grammar
-from clarity_scoring import score_clarity
-from engagement_scoring import score_engagement
-from validation import (
-    validate_transcript, validate_student_name, validate_duration,
-    validate_word_count, validate_sentence_count, sanitize_transcript
+from database import (
+    ensure_db, save_evaluation, save_evaluation_metrics, get_results_page, get_statistics,
+    get_score_aggregates, get_data_version, search_transcripts, get_student_summary, get_student_history,
+    MOVING_AVERAGE_WINDOW, SEARCH_RANK_WINDOW
 )
-
-# Initialize database
-init_db()
+from engagement_scoring import get_sentiment_analyzer
+from evaluation import CRITERIA, CRITERIA_MAX, extract_metrics
+from score_cache import get_score_cache
+from stage_timing import STAGE_METRIC_PREFIX, STAGE_TIMINGS, TIMING_PERSIST, collect, stage, timing_enabled
+from validation import validate_submission, sanitize_transcript
 
 # Page config
 st.set_page_config(
@@ -32,17 +27,63 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource(show_spinner=False)
+def load_resources():
+    """
+    Long-lived resources, set up once per server process rather than per rerun:
+    database schema and connection pool, sentiment lexicon and the score cache.
+    Scoring patterns are compiled when their modules are first imported.
+    Evaluations are scored inline in the session thread: a process pool forked
+    from the threaded server could not be recovered once a worker died.
+    """
+    ensure_db()
+    try:
+        get_sentiment_analyzer()
+    except (ImportError, LookupError):
+        pass  # engagement scoring falls back to neutral
+    return get_score_cache()
+
+# Query results are cached per data version: any new evaluation (from this
+# app or a batch job) changes the version, so stale results are never served
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def load_results_page(data_version, limit, cursor, student_name, date_from, date_to):
+    return get_results_page(limit, cursor, student_name, date_from, date_to)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def load_search_results(data_version, text, limit, cursor, order, student_name, date_from, date_to):
+    return search_transcripts(text, limit, cursor=cursor, order=order,
+                              student_name=student_name, date_from=date_from, date_to=date_to)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def load_student_progress(data_version, student_name, limit):
+    return get_student_summary(student_name), get_student_history(student_name, limit)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_statistics(data_version):
+    return get_statistics()
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_score_aggregates(data_version):
+    return get_score_aggregates()
+
+score_cache = load_resources()
+
 st.title("🎤 Speech Score Evaluator")
 st.markdown("*A comprehensive tool for evaluating student self-introductions based on rubric criteria*")
 
 # Sidebar navigation
 page = st.sidebar.radio(
     "Navigation",
-    ["📝 Evaluate Speech", "📊 View Results", "📈 Statistics"]
+    ["📝 Evaluate Speech", "📊 View Results", "👤 Student Progress", "📈 Statistics"]
 )
 
 def evaluate_speech():
     """Page for evaluating a new speech"""
+    # Heavy display libraries load on first use rather than at startup
+    import pandas as pd
+    import plotly.graph_objects as go
+    
     st.header("📝 Evaluate Student Speech")
     
     with st.form("evaluation_form", clear_on_submit=False):
@@ -69,90 +110,44 @@ def evaluate_speech():
         
         if submit_button:
             # Validate all inputs
-            name_valid, name_error = validate_student_name(student_name)
-            transcript_valid, transcript_error = validate_transcript(transcript)
-            duration_valid, duration_error = validate_duration(duration_seconds)
-            word_valid, word_error = validate_word_count(word_count)
-            sentence_valid, sentence_error = validate_sentence_count(sentence_count)
-            
-            if not name_valid:
-                st.error(f"❌ Student Name: {name_error}")
-                return
-            if not transcript_valid:
-                st.error(f"❌ Transcript: {transcript_error}")
-                return
-            if not duration_valid:
-                st.error(f"❌ Duration: {duration_error}")
-                return
-            if not word_valid:
-                st.error(f"❌ Word Count: {word_error}")
-                return
-            if not sentence_valid:
-                st.error(f"❌ Sentence Count: {sentence_error}")
+            is_valid, error_message = validate_submission(
+                student_name, transcript, duration_seconds, word_count, sentence_count
+            )
+            if not is_valid:
+                st.error(f"❌ {error_message}")
                 return
             
-            # Show evaluation in progress
-            with st.spinner("🔄 Evaluating speech..."):
+            # Show evaluation in progress; stage timings are gathered when instrumentation is on
+            score_id = None
+            with st.spinner("🔄 Evaluating speech..."), collect() as stage_timings:
                 try:
                     # Sanitize transcript
-                    transcript = sanitize_transcript(transcript)
+                    with stage('sanitize'):
+                        transcript = sanitize_transcript(transcript)
                     
-                    # Save transcript to database
-                    transcript_id = save_transcript(
-                        student_name, transcript, word_count, sentence_count, duration_seconds
-                    )
+                    # Calculate scores (identical resubmissions are served from the cache)
+                    with stage('score'):
+                        evaluation = score_cache.evaluate(transcript, word_count, duration_seconds)
+                    content_scores = evaluation['content']
+                    speech_rate_scores = evaluation['speech_rate']
+                    language_scores = evaluation['language']
+                    clarity_scores = evaluation['clarity']
+                    engagement_scores = evaluation['engagement']
+                    all_scores = evaluation['scores']
+                    feedback = evaluation['feedback']
                     
-                    # Calculate scores
-                    content_scores = score_content_structure(transcript)
-                    speech_rate_scores = score_speech_rate(word_count, duration_seconds)
-                    language_scores = score_language_grammar(transcript)
-                    clarity_scores = score_clarity(transcript)
-                    engagement_scores = score_engagement(transcript)
+                    total_score = all_scores['total']
+                    content_scaled = evaluation['scaled']['content']
+                    language_scaled = evaluation['scaled']['language']
+                    clarity_scaled = evaluation['scaled']['clarity']
+                    engagement_scaled = evaluation['scaled']['engagement']
                     
-                    # Combine all scores
-                    all_scores = {
-                        'salutation': content_scores['salutation'],
-                        'keyword_presence': content_scores['keyword_presence'],
-                        'flow': content_scores['flow'],
-                        'speech_rate': speech_rate_scores['speech_rate'],
-                        'grammar': language_scores['grammar'],
-                        'vocabulary': language_scores['vocabulary'],
-                        'filler_words': clarity_scores['filler_words'],
-                        'sentiment': engagement_scores['sentiment']
-                    }
-                    
-                    # Calculate total score based on weightage
-                    # Content & Structure: 40 (5+30+5)
-                    # Speech Rate: 10
-                    # Language & Grammar: 20 (10+10)
-                    # Clarity: 15
-                    # Engagement: 15
-                    
-                    content_total = content_scores['salutation'] + content_scores['keyword_presence'] + content_scores['flow']
-                    language_total = language_scores['grammar'] + language_scores['vocabulary']
-                    
-                    # Scale each section to their weightage
-                    content_scaled = (content_total / 40) * 40  # Already out of 40
-                    speech_rate_scaled = (speech_rate_scores['speech_rate'] / 10) * 10
-                    language_scaled = (language_total / 20) * 20
-                    clarity_scaled = (clarity_scores['filler_words'] / 15) * 15
-                    engagement_scaled = (engagement_scores['sentiment'] / 15) * 15
-                    
-                    total_score = content_scaled + speech_rate_scaled + language_scaled + clarity_scaled + engagement_scaled
-                    
-                    all_scores['total'] = total_score
-                    
-                    # Prepare feedback
-                    feedback = {
-                        'content': content_scores['feedback'],
-                        'speech_rate': speech_rate_scores['feedback'],
-                        'language': language_scores['feedback'],
-                        'clarity': clarity_scores['feedback'],
-                        'engagement': engagement_scores['feedback']
-                    }
-                    
-                    # Save score to database
-                    save_score(transcript_id, all_scores, feedback)
+                    # Save transcript and score to database in one transaction
+                    with stage('db_write'):
+                        _, score_id = save_evaluation(
+                            student_name, transcript, word_count, sentence_count, duration_seconds,
+                            all_scores, feedback, extract_metrics(evaluation)
+                        )
                     
                     # Display results
                     st.success("✅ Evaluation Complete!")
@@ -182,17 +177,8 @@ def evaluate_speech():
                             'Filler Words',
                             'Sentiment/Engagement'
                         ],
-                        'Score': [
-                            content_scores['salutation'],
-                            content_scores['keyword_presence'],
-                            content_scores['flow'],
-                            speech_rate_scores['speech_rate'],
-                            language_scores['grammar'],
-                            language_scores['vocabulary'],
-                            clarity_scores['filler_words'],
-                            engagement_scores['sentiment']
-                        ],
-                        'Max Score': [5, 30, 5, 10, 10, 10, 15, 15]
+                        'Score': [all_scores[criterion] for criterion in CRITERIA],
+                        'Max Score': [CRITERIA_MAX[criterion] for criterion in CRITERIA]
                     }
                     
                     df_breakdown = pd.DataFrame(breakdown_data)
@@ -234,71 +220,193 @@ def evaluate_speech():
                         st.write(f"- Filler Word Rate: {clarity_scores['metrics']['filler_word_rate']:.2f}%")
                     
                     # Visualization
-                    fig = go.Figure(data=[
-                        go.Scatterpolar(
-                            r=[
-                                content_scores['salutation'],
-                                content_scores['keyword_presence'],
-                                content_scores['flow'],
-                                speech_rate_scores['speech_rate'],
-                                language_scores['grammar'],
-                                language_scores['vocabulary'],
-                                clarity_scores['filler_words'],
-                                engagement_scores['sentiment']
-                            ],
-                            theta=[
-                                'Salutation',
-                                'Keywords',
-                                'Flow',
-                                'Speech Rate',
-                                'Grammar',
-                                'Vocabulary',
-                                'Clarity',
-                                'Engagement'
-                            ],
-                            fill='toself',
-                            name='Score'
-                        )
-                    ])
+                    with stage('chart_build'):
+                        fig = go.Figure(data=[
+                            go.Scatterpolar(
+                                r=[
+                                    content_scores['salutation'],
+                                    content_scores['keyword_presence'],
+                                    content_scores['flow'],
+                                    speech_rate_scores['speech_rate'],
+                                    language_scores['grammar'],
+                                    language_scores['vocabulary'],
+                                    clarity_scores['filler_words'],
+                                    engagement_scores['sentiment']
+                                ],
+                                theta=[
+                                    'Salutation',
+                                    'Keywords',
+                                    'Flow',
+                                    'Speech Rate',
+                                    'Grammar',
+                                    'Vocabulary',
+                                    'Clarity',
+                                    'Engagement'
+                                ],
+                                fill='toself',
+                                name='Score'
+                            )
+                        ])
                     
-                    fig.update_layout(
-                        polar=dict(radialaxis=dict(visible=True, range=[0, 30])),
-                        title="Score Radar Chart",
-                        height=500
-                    )
+                        fig.update_layout(
+                            polar=dict(radialaxis=dict(visible=True, range=[0, 30])),
+                            title="Score Radar Chart",
+                            height=500
+                        )
                     
-                    st.plotly_chart(fig, use_container_width=True)
+                        st.plotly_chart(fig, use_container_width=True)
                     
                 except Exception as e:
                     st.error(f"❌ Error during evaluation: {str(e)}")
                     with st.expander("Technical Details"):
                         st.code(traceback.format_exc())
+            
+            if stage_timings and TIMING_PERSIST and score_id is not None:
+                save_evaluation_metrics(
+                    score_id, [(STAGE_METRIC_PREFIX + name, seconds) for name, seconds in stage_timings]
+                )
+
+RESULTS_PAGE_SIZES = [25, 50, 100]
+
+# Orders offered for search results (see database.search_transcripts)
+SEARCH_ORDERS = {'rank': "Best match", 'newest': "Newest first"}
 
 def view_results():
     """Page to view previous evaluations"""
+    import pandas as pd
+    
     st.header("📊 View Evaluation Results")
     
-    transcripts = get_all_transcripts()
+    search_text = st.text_input(
+        "🔍 Search", placeholder='Words or "an exact phrase" from transcripts, or part of a student name'
+    ).strip()
+    
+    # Filters
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        student_filter = st.text_input("Student Name", placeholder="Exact student name (optional)").strip()
+    with col2:
+        date_filter = st.checkbox("Filter by date")
+        date_from = date_to = None
+        if date_filter:
+            date_col1, date_col2 = st.columns(2)
+            with date_col1:
+                date_from = st.date_input("From")
+            with date_col2:
+                date_to = st.date_input("To")
+    with col3:
+        page_size = st.selectbox("Rows per page", RESULTS_PAGE_SIZES)
     
-    if not transcripts:
-        st.info("No evaluations yet. Go to 'Evaluate Speech' to get started!")
+    # Search results are ranked by relevance, or listed newest first
+    search_order = 'rank'
+    if search_text:
+        search_order = st.radio("Order matches", list(SEARCH_ORDERS), format_func=SEARCH_ORDERS.get, horizontal=True)
+    
+    # Keyset pagination: the stack holds the cursor of every page visited,
+    # and starts over whenever the search or filters change
+    filters = (search_text, search_order, student_filter, date_from, date_to, page_size)
+    if st.session_state.get('results_filters') != filters:
+        st.session_state.results_filters = filters
+        st.session_state.results_cursors = [None]
+    cursors = st.session_state.results_cursors
+    
+    if search_text:
+        page = load_search_results(
+            get_data_version(), search_text, page_size, cursors[-1], search_order,
+            student_filter or None, date_from, date_to
+        )
+    else:
+        page = load_results_page(
+            get_data_version(), page_size, cursors[-1], student_filter or None, date_from, date_to
+        )
+    
+    if not page['rows']:
+        if search_text:
+            st.info("No transcripts match this search and these filters." if student_filter or date_filter
+                    else "No transcripts match this search.")
+        elif len(cursors) == 1 and not student_filter and not date_filter:
+            st.info("No evaluations yet. Go to 'Evaluate Speech' to get started!")
+        else:
+            st.info("No evaluations match these filters.")
         return
     
     # Create DataFrame
     df = pd.DataFrame(
-        transcripts,
+        page['rows'],
         columns=['ID', 'Student Name', 'Created At', 'Score']
     )
     
     st.dataframe(df, use_container_width=True)
     
+    if page.get('truncated'):
+        st.caption(f"Only the newest {SEARCH_RANK_WINDOW} matching transcripts are ranked; older matches are "
+                   f"left out. Order by newest first to page through every match.")
+    
+    nav_col1, nav_col2, nav_col3 = st.columns([1, 2, 1])
+    with nav_col1:
+        st.button("⬅️ Previous", disabled=len(cursors) == 1, on_click=cursors.pop)
+    with nav_col2:
+        st.caption(f"Page {len(cursors)}")
+    with nav_col3:
+        st.button("Next ➡️", disabled=page['next_cursor'] is None,
+                  on_click=cursors.append, args=(page['next_cursor'],))
+    
     st.info("Note: Detailed view of individual results coming soon!")
 
+# Most recent attempts charted on the Student Progress page
+TREND_ATTEMPTS = 50
+
+def view_student_progress():
+    """Page showing one student's score trend"""
+    import pandas as pd
+    
+    st.header("👤 Student Progress")
+    
+    student_name = st.text_input("Student Name", placeholder="Exact student name").strip()
+    if not student_name:
+        st.info("Enter a student name to see their progress.")
+        return
+    
+    # The summary is maintained on every save and the history is capped, so
+    # this loads in constant time however many attempts a student has
+    summary, history = load_student_progress(get_data_version(), student_name, TREND_ATTEMPTS)
+    if summary is None:
+        st.info("No scored evaluations for this student.")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Attempts", summary['attempts'])
+    with col2:
+        st.metric("Latest Score", f"{summary['latest_score']:.1f}")
+    with col3:
+        st.metric("Best Score", f"{summary['best_score']:.1f}")
+    with col4:
+        st.metric(f"Average (last {MOVING_AVERAGE_WINDOW})", f"{summary['moving_average']:.1f}")
+    
+    st.subheader("📈 Total Score Trend")
+    if summary['attempts'] > len(history):
+        st.caption(f"Latest {len(history)} of {summary['attempts']} attempts")
+    trend = pd.DataFrame(history)
+    trend['Attempt'] = range(summary['attempts'] - len(history) + 1, summary['attempts'] + 1)
+    trend = trend.set_index('Attempt')
+    trend['Moving Average'] = trend['total'].rolling(MOVING_AVERAGE_WINDOW, min_periods=1).mean()
+    st.line_chart(trend[['total', 'Moving Average']].rename(columns={'total': 'Total'}))
+    
+    # Per-criterion scores, newest first
+    st.subheader("📊 Criteria by Attempt")
+    criteria = trend[['created_at'] + CRITERIA + ['total']].iloc[::-1]
+    criteria.columns = ['Date'] + [criterion.replace('_', ' ').title() for criterion in CRITERIA] + ['Total']
+    st.dataframe(criteria, use_container_width=True)
+
 def view_statistics():
     """Page to view overall statistics"""
+    import pandas as pd
+    
     st.header("📈 Overall Statistics")
     
-    stats = get_statistics()
+    data_version = get_data_version()
+    stats = load_statistics(data_version)
     
     if stats['total_transcripts'] == 0:
         st.info("No data yet. Evaluate some speeches to see statistics!")
@@ -314,12 +422,50 @@ def view_statistics():
         st.metric("Highest Score", f"{stats['max_score']:.1f}" if stats['max_score'] else "N/A")
     with col4:
         st.metric("Lowest Score", f"{stats['min_score']:.1f}" if stats['min_score'] else "N/A")
+    
+    aggregates = load_score_aggregates(data_version)
+    if 'total' not in aggregates:
+        return
+    
+    # Per-criterion breakdown
+    st.subheader("📊 Criteria Breakdown")
+    breakdown = [
+        {
+            'Criteria': criterion.replace('_', ' ').title(),
+            'Average': aggregates[criterion]['average'],
+            'Lowest': aggregates[criterion]['min'],
+            'Highest': aggregates[criterion]['max'],
+            'Max Score': aggregates[criterion]['max_points']
+        }
+        for criterion in CRITERIA if criterion in aggregates
+    ]
+    st.dataframe(pd.DataFrame(breakdown), use_container_width=True)
+    
+    # Total score distribution
+    st.subheader("📉 Total Score Distribution")
+    histogram = aggregates['total']['histogram']
+    bin_width = aggregates['total']['max_points'] / len(histogram)
+    labels = [f"{i * bin_width:.0f}-{(i + 1) * bin_width:.0f}" for i in range(len(histogram))]
+    st.bar_chart(pd.DataFrame({'Evaluations': histogram}, index=labels))
+    
+    # Stage timings recorded by this server process
+    timings = STAGE_TIMINGS.snapshot()
+    if timing_enabled() and timings:
+        st.subheader("⏱️ Stage Timings")
+        st.dataframe(pd.DataFrame([
+            {'Stage': name, 'Calls': histogram['count'], 'Mean (ms)': histogram['mean'] * 1000}
+            for name, histogram in timings.items()
+        ]), use_container_width=True)
+        with st.expander("Prometheus format"):
+            st.code(STAGE_TIMINGS.render_prometheus())
 
 # Route pages
 if page == "📝 Evaluate Speech":
     evaluate_speech()
 elif page == "📊 View Results":
     view_results()
+elif page == "👤 Student Progress":
+    view_student_progress()
 elif page == "📈 Statistics":
     view_statistics()
 
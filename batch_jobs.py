@@ -0,0 +1,74 @@
+"""
+Shared plumbing for long-running batch jobs
+Batch scoring, rescoring, recomputation and export all stream work items
+through an optional process pool and report throughput while they run.
+"""
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional
+
+def print_progress(message: str):
+    """Default progress callback: one line on stderr, so stdout stays clean for output"""
+    print(message, file=sys.stderr)
+
+def bounded_map(func: Callable, items: Iterable, workers: int = 1,
+                max_pending: Optional[int] = None) -> Iterator[tuple]:
+    """
+    Yield (item, func(item)) in input order
+    With workers > 1, items go to a process pool (func and items must be
+    picklable); at most max_pending (default workers * 2) are in flight, so
+    the input is never read far ahead of the output
+    """
+    if workers <= 1:
+        for item in items:
+            yield item, func(item)
+        return
+
+    max_pending = max_pending or workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(func, item)))
+            if len(pending) >= max_pending:
+                item, future = pending.popleft()
+                yield item, future.result()
+
+        while pending:
+            item, future = pending.popleft()
+            yield item, future.result()
+
+class ThroughputReporter:
+    """
+    Periodic "N <action> (rate rows/s)" progress lines for a running job,
+    with "N/total" and an ETA once the total is known
+    """
+
+    def __init__(self, action: str, interval: float = 5.0,
+                 progress: Optional[Callable[[str], None]] = None, total: Optional[int] = None):
+        self.action = action
+        self.interval = interval
+        self.progress = progress or print_progress
+        self.total = total
+        self.started = self.last_report = time.perf_counter()
+
+    def update(self, done: int):
+        """Report done items so far, at most once per interval"""
+        now = time.perf_counter()
+        if now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        rate = done / (now - self.started)
+        if self.total is None:
+            self.progress(f"{done} {self.action} ({rate:.1f} rows/s)")
+        else:
+            eta = (self.total - done) / rate if rate else 0
+            self.progress(f"{done}/{self.total} {self.action} ({rate:.1f} rows/s, ETA {eta:.0f}s)")
+
+    def finish(self, done: int, outcome: str) -> dict:
+        """Report "Done: <outcome>" with elapsed time; returns the summary timing fields"""
+        elapsed = time.perf_counter() - self.started
+        rows_per_second = done / elapsed if elapsed > 0 else 0
+        self.progress(f"Done: {outcome} in {elapsed:.1f}s ({rows_per_second:.1f} rows/s)")
+        return {'elapsed_seconds': elapsed, 'rows_per_second': rows_per_second}
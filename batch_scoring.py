@@ -0,0 +1,227 @@
+"""
+Headless batch scoring
+Streams transcripts from CSV/JSONL, scores them across a process pool and
+streams results out again, so memory stays bounded for any input size
+"""
+import csv
+import json
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from batch_jobs import ThroughputReporter, bounded_map
+from evaluation import CRITERIA, evaluate_transcript, extract_metrics
+from validation import validate_submission, sanitize_transcript
+
+# Accepted input column names, first match wins
+FIELD_ALIASES = {
+    'student_name': ['student_name', 'name'],
+    'transcript': ['transcript', 'text'],
+    'word_count': ['word_count', 'words'],
+    'sentence_count': ['sentence_count', 'sentences'],
+    'duration_seconds': ['duration_seconds', 'duration']
+}
+
+RESULT_COLUMNS = ['row', 'student_name'] + CRITERIA + ['total', 'feedback', 'error']
+
+# Set by read_rows on a JSONL line that is not a JSON object; score_row reports it as the row's error
+PARSE_ERROR = '_parse_error'
+
+def read_rows(path: str, input_format: Optional[str] = None) -> Iterator[dict]:
+    """
+    Lazily yield input rows from a CSV or JSONL file (format taken from the extension if not given)
+    A malformed JSONL line yields {PARSE_ERROR: message} instead of stopping the run
+    """
+    input_format = input_format or detect_format(path)
+
+    with open(path, newline='', encoding='utf-8') as f:
+        if input_format == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield {PARSE_ERROR: f"Invalid JSON on line {line_number}: {e.msg} (column {e.colno})"}
+                    continue
+                if not isinstance(row, dict):
+                    yield {PARSE_ERROR: f"Line {line_number} is not a JSON object"}
+                    continue
+                yield row
+
+def detect_format(path: str) -> str:
+    """Map a file extension to 'csv' or 'jsonl'"""
+    return 'csv' if Path(path).suffix.lower() == '.csv' else 'jsonl'
+
+def normalize_row(row: dict) -> dict:
+    """Resolve column aliases and convert numeric fields (CSV values arrive as strings, JSON ones may be floats)"""
+    normalized = {}
+    for field, aliases in FIELD_ALIASES.items():
+        normalized[field] = next((row[alias] for alias in aliases if row.get(alias) not in (None, '')), None)
+
+    for field in ('word_count', 'sentence_count', 'duration_seconds'):
+        value = normalized[field]
+        if isinstance(value, str):
+            try:
+                value = float(value)
+            except ValueError:
+                continue  # left as-is so validation reports it
+        # Whole floats count as integers, whether read from CSV text or JSON (131.0)
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        normalized[field] = value
+
+    return normalized
+
+def score_row(row_number: int, row: dict, use_cache: bool = False) -> dict:
+    """
+    Validate, sanitize and score one input row; failures are reported in 'error'
+    use_cache serves repeated transcripts from the shared score cache
+    """
+    if PARSE_ERROR in row:
+        return {'row': row_number, 'student_name': None, 'error': row[PARSE_ERROR]}
+
+    row = normalize_row(row)
+    result = {'row': row_number, 'student_name': row['student_name'], 'error': None}
+
+    is_valid, error_message = validate_submission(
+        row['student_name'], row['transcript'], row['duration_seconds'],
+        row['word_count'], row['sentence_count']
+    )
+    if not is_valid:
+        result['error'] = error_message
+        return result
+
+    try:
+        transcript = sanitize_transcript(row['transcript'])
+        if use_cache:
+            from score_cache import get_score_cache
+            evaluation = get_score_cache().evaluate(transcript, row['word_count'], row['duration_seconds'])
+        else:
+            evaluation = evaluate_transcript(transcript, row['word_count'], row['duration_seconds'])
+    except Exception as e:
+        result['error'] = f"Scoring failed: {e}"
+        return result
+
+    result['scores'] = evaluation['scores']
+    result['feedback'] = evaluation['feedback']
+    result['metrics'] = extract_metrics(evaluation)
+    return result
+
+def _score_chunk(chunk: list, use_cache: bool = False) -> list:
+    return [score_row(row_number, row, use_cache) for row_number, row in chunk]
+
+def _chunks(rows: Iterable[dict], chunk_size: int) -> Iterator[list]:
+    numbered = enumerate(rows, 1)
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def score_rows(rows: Iterable[dict], workers: int = 1, chunk_size: int = 64,
+               max_pending: Optional[int] = None, use_cache: bool = False) -> Iterator[tuple]:
+    """
+    Score rows in input order, yielding (input_row, result) pairs
+    With workers > 1, chunks go to a process pool; at most max_pending chunks
+    are in flight, so the input is never read far ahead of the output
+    """
+    score_chunk = partial(_score_chunk, use_cache=use_cache)
+    for chunk, results in bounded_map(score_chunk, _chunks(rows, chunk_size), workers, max_pending):
+        yield from zip((row for _, row in chunk), results)
+
+class JsonlResultWriter:
+    """Write one JSON object per result"""
+
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, result: dict):
+        self.f.write(json.dumps(result) + '\n')
+
+class CsvResultWriter:
+    """Write one flat CSV row per result, feedback as a JSON column"""
+
+    def __init__(self, f):
+        self.writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, result: dict):
+        row = {'row': result['row'], 'student_name': result['student_name'], 'error': result['error']}
+        if result['error'] is None:
+            row.update(result['scores'])
+            row['feedback'] = json.dumps(result['feedback'])
+        self.writer.writerow(row)
+
+RESULT_WRITERS = {
+    'jsonl': JsonlResultWriter,
+    'csv': CsvResultWriter
+}
+
+def evaluation_record(row: dict, result: dict) -> dict:
+    """Database record for a successfully scored row"""
+    row = normalize_row(row)
+    return {
+        'student_name': row['student_name'],
+        'transcript': sanitize_transcript(row['transcript']),
+        'word_count': row['word_count'],
+        'sentence_count': row['sentence_count'],
+        'duration_seconds': row['duration_seconds'],
+        'scores': result['scores'],
+        'feedback': result['feedback'],
+        'metrics': result.get('metrics')
+    }
+
+def run_batch(input_path: str, output_path: str, input_format: Optional[str] = None,
+              output_format: Optional[str] = None, workers: int = 1, chunk_size: int = 64,
+              save_to_db: bool = False, db_batch_size: int = 500, use_cache: bool = False,
+              progress_interval: float = 5.0,
+              progress: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    Score every row of input_path and stream results to output_path
+    Returns a summary with row counts, elapsed time and rows per second
+    With save_to_db, scored rows are written in transactions of db_batch_size
+    With use_cache, workers reuse results for transcripts scored before
+    """
+    output_format = output_format or detect_format(output_path)
+
+    if save_to_db or use_cache:
+        # Imported only when needed, so plain scoring runs never load the database
+        # module. With use_cache, workers load it too, for the cache's persistent tier
+        from database import init_db, save_evaluations_many
+        init_db()
+    pending_records = []
+
+    scored = failed = 0
+    reporter = ThroughputReporter("rows processed", progress_interval, progress)
+
+    with open(output_path, 'w', newline='', encoding='utf-8') as out:
+        writer = RESULT_WRITERS[output_format](out)
+        rows = read_rows(input_path, input_format)
+
+        for row, result in score_rows(rows, workers=workers, chunk_size=chunk_size, use_cache=use_cache):
+            writer.write(result)
+            if result['error'] is None:
+                scored += 1
+                if save_to_db:
+                    pending_records.append(evaluation_record(row, result))
+                    if len(pending_records) >= db_batch_size:
+                        save_evaluations_many(pending_records)
+                        pending_records = []
+            else:
+                failed += 1
+            reporter.update(scored + failed)
+
+        if pending_records:
+            save_evaluations_many(pending_records)
+
+    total = scored + failed
+    return {
+        'rows': total,
+        'scored': scored,
+        'failed': failed,
+        **reporter.finish(total, f"{scored} scored, {failed} failed")
+    }
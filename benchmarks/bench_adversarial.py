@@ -0,0 +1,104 @@
+"""
+Worst-case input benchmark
+Times the content scorers on adversarial transcripts (a pattern's first word
+repeated with no terminator, long digit runs) at growing sizes up to the
+validation length limit, and fits how time grows with input length. Exits
+non-zero when any case grows faster than --max-exponent (1.0 is linear), so
+a pattern that backtracks quadratically fails the run.
+
+Usage:
+    python benchmarks/bench_adversarial.py
+    python benchmarks/bench_adversarial.py --output adversarial.json
+"""
+import argparse
+import json
+import math
+import sys
+from pathlib import Path
+
+# Add project to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_scorers import _metadata, measure
+from content_scoring import check_flow, score_content_structure
+from transcript_analysis import analyze_transcript
+from validation import MAX_TRANSCRIPT_LENGTH
+
+# Case name -> unit repeated up to the input length
+ADVERSARIAL_CASES = {
+    'free_time': "free time ",
+    'career': "career ",
+    'year': "year ",
+    'digits': "1",
+    'greetings': "hello hi good ",
+    'mixed': "free time career year 12 ",
+}
+
+# Input lengths in characters, doubling up to MAX_TRANSCRIPT_LENGTH
+SIZES = [MAX_TRANSCRIPT_LENGTH // 8, MAX_TRANSCRIPT_LENGTH // 4, MAX_TRANSCRIPT_LENGTH // 2, MAX_TRANSCRIPT_LENGTH]
+
+def adversarial_text(unit: str, chars: int) -> str:
+    return (unit * (chars // len(unit) + 1))[:chars]
+
+def growth_exponent(points: list) -> float:
+    """Least-squares slope of log(time) over log(size); about 1 for linear, 2 for quadratic"""
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(seconds) for _, seconds in points]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    return (sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+            / sum((x - x_mean) ** 2 for x in xs))
+
+def run_adversarial(sizes=SIZES, min_time: float = 0.2, min_calls: int = 3, progress=print) -> dict:
+    """Time content scoring of every case at every size and fit each case's growth"""
+    cases = []
+    for name, unit in ADVERSARIAL_CASES.items():
+        points = []
+        for size in sizes:
+            # Analysis is shared by all scorers and linear; only the pattern scans are timed
+            analysis = analyze_transcript(adversarial_text(unit, size))
+            stats = measure(lambda: (score_content_structure(analysis), check_flow(analysis)), min_time, min_calls)
+            seconds = stats['latency_ms']['p50'] / 1000
+            points.append((size, seconds))
+            progress(f"{name:<10} {size:>6} chars  p50 {seconds * 1000:9.3f} ms")
+
+        cases.append({
+            'case': name,
+            'points': [{'chars': size, 'p50_seconds': seconds} for size, seconds in points],
+            'exponent': growth_exponent(points),
+        })
+
+    return {
+        'metadata': _metadata(0, min_time, min_calls),
+        'cases': cases,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that content scoring stays linear on worst-case input")
+    parser.add_argument('--output', help="Write JSON results to this file")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help="Input lengths in characters")
+    parser.add_argument('--max-exponent', type=float, default=1.3,
+                        help="Largest accepted growth exponent (1.0 is linear, 2.0 quadratic)")
+    parser.add_argument('--min-time', type=float, default=0.2, help="Minimum seconds per measurement")
+    parser.add_argument('--min-calls', type=int, default=3, help="Minimum calls per measurement")
+    args = parser.parse_args(argv)
+
+    report = run_adversarial(args.sizes, args.min_time, args.min_calls)
+    report['max_exponent'] = args.max_exponent
+
+    failed = []
+    for case in report['cases']:
+        verdict = 'ok' if case['exponent'] <= args.max_exponent else 'SUPERLINEAR'
+        print(f"{case['case']:<10} growth exponent {case['exponent']:5.2f}  {verdict}")
+        if verdict != 'ok':
+            failed.append(case['case'])
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if failed:
+        print(f"Superlinear scoring time: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
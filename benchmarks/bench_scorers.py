@@ -0,0 +1,164 @@
+"""
+Scorer benchmark suite
+Times every scorer and the full evaluation over transcripts from 50 words up
+to the validation length limit, reporting throughput, latency percentiles and
+peak memory, and writes JSON results that can be compared between versions
+
+Usage:
+    python benchmarks/bench_scorers.py --output results.json
+    python benchmarks/bench_scorers.py --output new.json --compare old.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Add project to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from content_scoring import score_content_structure
+from speech_rate_scoring import score_speech_rate
+from language_grammar_scoring import score_language_grammar
+from clarity_scoring import score_clarity
+from engagement_scoring import score_engagement
+from evaluation import SCORER_VERSION, evaluate_transcript
+from validation import MAX_TRANSCRIPT_LENGTH
+from transcript_generator import generate_transcript
+
+# Word counts to benchmark; the last size is capped at MAX_TRANSCRIPT_LENGTH characters
+SIZES = [50, 200, 1000, 3000, 10000]
+
+# Assumed speaking rate for generated durations (ideal band)
+WORDS_PER_MINUTE = 125
+
+def _scorers(transcript: str, word_count: int, duration: int) -> dict:
+    """Name -> zero-argument callable for one input"""
+    return {
+        'score_content_structure': lambda: score_content_structure(transcript),
+        'score_speech_rate': lambda: score_speech_rate(word_count, duration),
+        'score_language_grammar': lambda: score_language_grammar(transcript),
+        'score_clarity': lambda: score_clarity(transcript),
+        'score_engagement': lambda: score_engagement(transcript),
+        'evaluate_transcript': lambda: evaluate_transcript(transcript, word_count, duration),
+    }
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def measure(func, min_time: float, min_calls: int) -> dict:
+    """Time repeated calls until both min_time seconds and min_calls calls are reached"""
+    func()  # warm-up: lazy loads and regex caches are not part of steady state
+
+    latencies = []
+    started = time.perf_counter()
+    while len(latencies) < min_calls or time.perf_counter() - started < min_time:
+        call_started = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'calls': len(latencies),
+        'calls_per_second': len(latencies) / elapsed,
+        'latency_ms': {
+            'mean': sum(latencies) / len(latencies) * 1000,
+            'p50': _percentile(latencies, 0.50) * 1000,
+            'p90': _percentile(latencies, 0.90) * 1000,
+            'p99': _percentile(latencies, 0.99) * 1000,
+            'max': latencies[-1] * 1000,
+        },
+        'peak_memory_bytes': peak,
+    }
+
+def run_benchmarks(sizes=SIZES, min_time: float = 0.5, min_calls: int = 5, seed: int = 0,
+                   only=None, progress=print) -> dict:
+    """Benchmark every scorer at every size and return a JSON-serializable report"""
+    results = []
+    for size in sizes:
+        transcript = generate_transcript(size, seed=seed, max_chars=MAX_TRANSCRIPT_LENGTH)
+        word_count = len(transcript.split())
+        duration = max(1, round(word_count / WORDS_PER_MINUTE * 60))
+
+        for name, func in _scorers(transcript, word_count, duration).items():
+            if only and name not in only:
+                continue
+            stats = measure(func, min_time, min_calls)
+            stats.update({
+                'scorer': name,
+                'words': word_count,
+                'chars': len(transcript),
+                'words_per_second': word_count * stats['calls_per_second'],
+            })
+            results.append(stats)
+            progress(f"{name:<26} {word_count:>6} words  p50 {stats['latency_ms']['p50']:9.3f} ms  "
+                     f"{stats['calls_per_second']:10.1f} calls/s  peak {stats['peak_memory_bytes'] / 1024:8.1f} KiB")
+
+    return {
+        'metadata': _metadata(seed, min_time, min_calls),
+        'results': results,
+    }
+
+def _metadata(seed: int, min_time: float, min_calls: int) -> dict:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=Path(__file__).resolve().parent, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': commit,
+        'scorer_version': SCORER_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'min_time': min_time,
+        'min_calls': min_calls,
+    }
+
+def compare(current: dict, baseline: dict, progress=print):
+    """Print p50 latency ratios (current / baseline) for matching scorer and size"""
+    previous = {(r['scorer'], r['words']): r for r in baseline['results']}
+    progress(f"Compared with {baseline['metadata'].get('git_commit')} ({baseline['metadata'].get('timestamp')})")
+    for result in current['results']:
+        before = previous.get((result['scorer'], result['words']))
+        if before is None:
+            continue
+        ratio = result['latency_ms']['p50'] / before['latency_ms']['p50']
+        progress(f"{result['scorer']:<26} {result['words']:>6} words  p50 x{ratio:6.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the speech scorers")
+    parser.add_argument('--output', help="Write JSON results to this file")
+    parser.add_argument('--compare', help="Earlier JSON results to compare against")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help="Transcript sizes in words")
+    parser.add_argument('--scorer', action='append', help="Only run the named scorer (repeatable)")
+    parser.add_argument('--min-time', type=float, default=0.5, help="Minimum seconds per measurement")
+    parser.add_argument('--min-calls', type=int, default=5, help="Minimum calls per measurement")
+    parser.add_argument('--seed', type=int, default=0, help="Transcript generator seed")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.min_time, args.min_calls, args.seed, args.scorer)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text()))
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,8 @@
-import re
+from stage_timing import timed
+from transcript_analysis import TOKEN_PATTERN, TranscriptInput, ensure_analyzed
+
+# Scorer version, stored with every score; bump it whenever FILLER_WORDS or the bands change
+CLARITY_VERSION = "1"
 
 FILLER_WORDS = [
     'um', 'uh', 'like', 'you know', 'so', 'actually', 'basically', 
@@ -6,42 +10,97 @@ FILLER_WORDS = [
     'erm', 'er', 'aah'
 ]
 
-def count_filler_words(transcript: str) -> int:
-    """Count filler words in transcript"""
-    text_lower = transcript.lower()
-    filler_count = 0
-    
-    for filler in FILLER_WORDS:
-        # Use word boundaries for single words, but allow flexibility for phrases
-        if ' ' in filler:
-            # For multi-word fillers like "you know", "i mean"
-            pattern = r'\b' + filler.replace(' ', r'\s+') + r'\b'
-        else:
-            # For single word fillers
-            pattern = r'\b' + filler + r'\b'
+# Filler-rate bands as (highest rate in %, points, level), checked in order
+CLARITY_BANDS = [
+    (3, 15, "Excellent"),
+    (6, 12, "Very Good"),
+    (9, 9, "Good"),
+    (12, 6, "Fair"),
+]
+CLARITY_FALLBACK = (3, "Poor")
+
+# Marks the trie node where a complete filler ends
+FILLER_END = None
+
+_filler_trie_cache = {}
+
+def build_filler_trie(fillers) -> dict:
+    """
+    Build a token trie from filler entries
+    Each entry is one or more whitespace-separated words, e.g. "you know"
+    """
+    trie = {}
+    for filler in fillers:
+        words = filler.lower().split()
+        if not words or not all(TOKEN_PATTERN.fullmatch(word) for word in words):
+            raise ValueError(f"Filler entry must be whitespace-separated words: {filler!r}")
         
-        matches = re.findall(pattern, text_lower)
-        filler_count += len(matches)
+        node = trie
+        for word in words:
+            node = node.setdefault(word, {})
+        node[FILLER_END] = filler
+    return trie
+
+def get_filler_trie() -> dict:
+    """Trie for the current FILLER_WORDS, rebuilt only if the list changes"""
+    key = tuple(FILLER_WORDS)
+    trie = _filler_trie_cache.get(key)
+    if trie is None:
+        _filler_trie_cache.clear()
+        trie = _filler_trie_cache[key] = build_filler_trie(key)
+    return trie
+
+def find_filler_words(transcript: TranscriptInput) -> dict:
+    """
+    Find every filler occurrence in one walk over the token stream
+    Returns {filler: [(start, end), ...]} with spans into the transcript text
+    Multi-word fillers only match across whitespace, as in "you  know"
+    """
+    analysis = ensure_analyzed(transcript)
+    trie = get_filler_trie()
+    tokens = analysis.tokens
+    spans = analysis.token_spans
+    text = analysis.text
+    token_total = len(tokens)
+    found = {}
     
-    return filler_count
+    for i in range(token_total):
+        node = trie.get(tokens[i])
+        j = i
+        while node is not None:
+            filler = node.get(FILLER_END)
+            if filler is not None:
+                found.setdefault(filler, []).append((spans[i][0], spans[j][1]))
+            
+            j += 1
+            if j >= token_total or not text[spans[j - 1][1]:spans[j][0]].isspace():
+                break
+            node = node.get(tokens[j])
+    
+    return found
+
+def count_filler_words(transcript: TranscriptInput) -> int:
+    """Count filler words in transcript"""
+    return sum(len(spans) for spans in find_filler_words(transcript).values())
 
-def calculate_filler_word_rate(transcript: str) -> tuple:
+def calculate_filler_word_rate(transcript: TranscriptInput) -> tuple:
     """
     Calculate filler word rate
     Rate = (Number of filler words / Total words) * 100
     """
-    words = re.findall(r'\b\w+\b', transcript)
-    total_words = len(words)
+    analysis = ensure_analyzed(transcript)
+    total_words = analysis.word_count
     
     if total_words == 0:
         return 0, 0
     
-    filler_count = count_filler_words(transcript)
+    filler_count = count_filler_words(analysis)
     rate = (filler_count / total_words) * 100
     
     return rate, filler_count
 
-def score_clarity(transcript: str) -> dict:
+@timed('clarity')
+def score_clarity(transcript: TranscriptInput) -> dict:
     """
     Score clarity based on filler word rate (0-15 points)
     0-3%: 15 pts
@@ -50,23 +109,17 @@ def score_clarity(transcript: str) -> dict:
     10-12%: 6 pts
     13%+: 3 pts
     """
-    rate, filler_count = calculate_filler_word_rate(transcript)
+    analysis = ensure_analyzed(transcript)
+    total_words = analysis.word_count
+    filler_count = count_filler_words(analysis) if total_words else 0
+    return score_clarity_from_counts(filler_count, total_words)
+
+def score_clarity_from_counts(filler_count: int, total_words: int) -> dict:
+    """Apply the clarity rubric bands to already counted fillers and words"""
+    rate = (filler_count / total_words) * 100 if total_words else 0
     
-    if rate <= 3:
-        score = 15
-        level = "Excellent"
-    elif rate <= 6:
-        score = 12
-        level = "Very Good"
-    elif rate <= 9:
-        score = 9
-        level = "Good"
-    elif rate <= 12:
-        score = 6
-        level = "Fair"
-    else:
-        score = 3
-        level = "Poor"
+    score, level = next(((points, level) for highest, points, level in CLARITY_BANDS if rate <= highest),
+                        CLARITY_FALLBACK)
     
     feedback = f"Clarity: {level} - Filler word rate: {rate:.2f}% ({filler_count} filler words)"
     
@@ -77,6 +130,6 @@ def score_clarity(transcript: str) -> dict:
         'metrics': {
             'filler_word_rate': rate,
             'filler_count': filler_count,
-            'total_words': len(re.findall(r'\b\w+\b', transcript))
+            'total_words': total_words
         }
     }
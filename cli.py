@@ -0,0 +1,199 @@
+"""
+Command-line entry point for headless operations
+Usage: python cli.py <command> [options]
+"""
+import argparse
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+# Add project to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+def cmd_score(args):
+    from batch_scoring import run_batch
+
+    run_batch(
+        args.input, args.output,
+        input_format=args.input_format,
+        output_format=args.output_format,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        save_to_db=args.save_to_db,
+        db_batch_size=args.db_batch_size,
+        use_cache=args.cache,
+        progress_interval=args.progress_interval
+    )
+
+def cmd_download_lexicon(args):
+    from engagement_scoring import download_lexicon
+
+    print(f"VADER lexicon installed in {download_lexicon(args.target)}")
+
+def cmd_rebuild_aggregates(args):
+    from database import ensure_db, rebuild_aggregates, get_statistics
+
+    ensure_db()
+    rebuild_aggregates()
+    print(f"Aggregates rebuilt: {get_statistics()}")
+
+def cmd_rebuild_search_index(args):
+    from database import ensure_db, rebuild_search_index
+
+    ensure_db()
+    rebuild_search_index()
+    print("Search index rebuilt")
+
+def cmd_stage_timings(args):
+    from database import ensure_db, iter_evaluation_metrics
+    from stage_timing import STAGE_METRIC_PREFIX, StageTimings
+
+    ensure_db()
+    timings = StageTimings()
+    for _, name, seconds in iter_evaluation_metrics(STAGE_METRIC_PREFIX):
+        timings.observe(name[len(STAGE_METRIC_PREFIX):], seconds)
+    print(timings.render_prometheus(), end='')
+
+def cmd_compact_storage(args):
+    from database import compact_feedback, ensure_db, migrate_transcript_blobs
+
+    ensure_db()
+    transcripts = migrate_transcript_blobs(batch_size=args.batch_size)
+    saved = transcripts['bytes_before'] - transcripts['bytes_after']
+    print(f"Moved {transcripts['rows']} transcripts into {transcripts['blobs']} compressed blobs: "
+          f"{transcripts['bytes_before']} -> {transcripts['bytes_after']} bytes ({saved} bytes saved)")
+
+    feedback = compact_feedback(batch_size=args.batch_size, vacuum=args.vacuum)
+    saved = feedback['bytes_before'] - feedback['bytes_after']
+    print(f"Compacted feedback of {feedback['rows']} scores: {feedback['bytes_before']} -> "
+          f"{feedback['bytes_after']} bytes ({saved} bytes saved)")
+
+def cmd_export(args):
+    from database import ensure_db
+    from results_export import export_results
+
+    ensure_db()
+    export_results(
+        args.output,
+        output_format=args.format,
+        batch_size=args.batch_size,
+        student_name=args.student,
+        date_from=args.date_from,
+        date_to=args.date_to,
+        progress_interval=args.progress_interval
+    )
+
+def cmd_rescore(args):
+    from database import ensure_db
+    from rescoring import run_rescore
+
+    ensure_db()
+    try:
+        run_rescore(
+            job_id=args.job,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            restart=args.restart,
+            progress_interval=args.progress_interval
+        )
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume from the last saved batch", file=sys.stderr)
+        sys.exit(130)
+    except RuntimeError as e:
+        print(f"Rescoring stopped: {e}", file=sys.stderr)
+        sys.exit(1)
+
+def cmd_recompute(args):
+    from database import ensure_db
+    from rescoring import recompute_stale
+
+    ensure_db()
+    try:
+        recompute_stale(
+            workers=args.workers,
+            batch_size=args.batch_size,
+            progress_interval=args.progress_interval
+        )
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to recompute the remaining scores", file=sys.stderr)
+        sys.exit(130)
+    except RuntimeError as e:
+        print(f"Recompute stopped: {e}", file=sys.stderr)
+        sys.exit(1)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Speech Score Evaluator command-line tools")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    score = subparsers.add_parser('score', help="Batch-score transcripts from a CSV or JSONL file")
+    score.add_argument('input', help="Input file with student_name, transcript, word_count, sentence_count, duration_seconds")
+    score.add_argument('output', help="Output file for results (.jsonl or .csv)")
+    score.add_argument('--input-format', choices=['csv', 'jsonl'], help="Default: from the input extension")
+    score.add_argument('--output-format', choices=['csv', 'jsonl'], help="Default: from the output extension")
+    score.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Scoring processes (default: CPU count)")
+    score.add_argument('--chunk-size', type=int, default=64, help="Rows sent to a worker at a time")
+    score.add_argument('--save-to-db', action='store_true', help="Also store transcripts and scores in the database")
+    score.add_argument('--db-batch-size', type=int, default=500, help="Rows per database transaction with --save-to-db")
+    score.add_argument('--cache', action='store_true', help="Reuse stored results for transcripts scored before")
+    score.add_argument('--progress-interval', type=float, default=5.0, help="Seconds between progress reports")
+    score.set_defaults(func=cmd_score)
+
+    lexicon = subparsers.add_parser('download-lexicon', help="Download the VADER lexicon into the bundled nltk_data directory")
+    lexicon.add_argument('--target', help="Directory to install into (default: NLTK_DATA_PATH)")
+    lexicon.set_defaults(func=cmd_download_lexicon)
+
+    aggregates = subparsers.add_parser('rebuild-aggregates', help="Recompute the materialized statistics from all scores")
+    aggregates.set_defaults(func=cmd_rebuild_aggregates)
+
+    search_index = subparsers.add_parser('rebuild-search-index', help="Re-index every transcript for full-text search")
+    search_index.set_defaults(func=cmd_rebuild_search_index)
+
+    stage_timings = subparsers.add_parser(
+        'stage-timings', help="Print persisted evaluation stage timings in Prometheus text format"
+    )
+    stage_timings.set_defaults(func=cmd_stage_timings)
+
+    rescore = subparsers.add_parser(
+        'rescore', help="Score every stored transcript again with the current rubric (resumable)"
+    )
+    rescore.add_argument('--job', help="Job name for the checkpoint (default: rescore-<rubric version>)")
+    rescore.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Scoring processes (default: CPU count)")
+    rescore.add_argument('--batch-size', type=int, default=200, help="Transcripts per batch and per transaction")
+    rescore.add_argument('--restart', action='store_true', help="Discard the job's checkpoint and start over")
+    rescore.add_argument('--progress-interval', type=float, default=5.0, help="Seconds between progress reports")
+    rescore.set_defaults(func=cmd_rescore)
+
+    recompute = subparsers.add_parser(
+        'recompute', help="Rerun only the criteria whose scorer version changed on each latest score"
+    )
+    recompute.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Scoring processes (default: CPU count)")
+    recompute.add_argument('--batch-size', type=int, default=200, help="Scores per batch and per transaction")
+    recompute.add_argument('--progress-interval', type=float, default=5.0, help="Seconds between progress reports")
+    recompute.set_defaults(func=cmd_recompute)
+
+    export = subparsers.add_parser('export', help="Stream stored scores and feedback to CSV, JSONL or Parquet")
+    export.add_argument('output', help="Output file (.csv, .jsonl or .parquet)")
+    export.add_argument('--format', choices=['csv', 'jsonl', 'parquet'], help="Default: from the output extension")
+    export.add_argument('--batch-size', type=int, default=5000, help="Rows fetched and written at a time")
+    export.add_argument('--student', help="Only this student's evaluations")
+    export.add_argument('--date-from', type=date.fromisoformat, help="First submission date (YYYY-MM-DD, local time)")
+    export.add_argument('--date-to', type=date.fromisoformat, help="Last submission date (YYYY-MM-DD, local time)")
+    export.add_argument('--progress-interval', type=float, default=5.0, help="Seconds between progress reports")
+    export.set_defaults(func=cmd_export)
+
+    compact = subparsers.add_parser(
+        'compact-storage', help="Deduplicate and compress transcripts and feedback stored by older versions"
+    )
+    compact.add_argument('--batch-size', type=int, default=500, help="Rows rewritten per transaction")
+    compact.add_argument('--vacuum', action='store_true', help="Rebuild the database file afterwards to release space")
+    compact.set_defaults(func=cmd_compact_storage)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Vectorized cohort scoring
+Applies the rubric band tables and section weighting to whole columns of raw
+metrics at once, so a class (or the full history) can be rescored after a
+threshold change without running the scorers row by row
+"""
+from typing import Iterable, Mapping, Union
+
+import numpy as np
+import pandas as pd
+
+from clarity_scoring import CLARITY_BANDS, CLARITY_FALLBACK
+from engagement_scoring import ENGAGEMENT_BANDS, ENGAGEMENT_FALLBACK
+from evaluation import CRITERIA, SECTIONS, extract_metrics
+from language_grammar_scoring import GRAMMAR_BANDS, GRAMMAR_FALLBACK, VOCABULARY_BANDS, VOCABULARY_FALLBACK
+from speech_rate_scoring import SPEECH_RATE_BANDS, SPEECH_RATE_FALLBACK
+
+# Raw metrics a cohort frame needs. Content criteria come from pattern
+# detections on the text, so they are taken as already scored points.
+METRIC_COLUMNS = [
+    'salutation', 'keyword_presence', 'flow',
+    'wpm', 'errors_per_100', 'ttr', 'filler_word_rate', 'sentiment_score'
+]
+
+# Optional columns: a zero duration or zero token count scores 0 for speech
+# rate or grammar, as the per-transcript scorers do
+OPTIONAL_COLUMNS = ['duration_seconds', 'total_words']
+
+CohortInput = Union[pd.DataFrame, Mapping[str, Iterable]]
+
+def _at_least(values: np.ndarray, bands, fallback_points) -> np.ndarray:
+    """First band whose lower bound the value reaches, as in a >= if/elif chain"""
+    return np.select([values >= lowest for lowest, *_ in bands],
+                     [band[1] for band in bands], default=fallback_points)
+
+def _at_most(values: np.ndarray, bands, fallback_points) -> np.ndarray:
+    """First band whose upper bound the value stays within, as in a <= if/elif chain"""
+    return np.select([values <= highest for highest, *_ in bands],
+                     [band[1] for band in bands], default=fallback_points)
+
+def speech_rate_points(wpm: np.ndarray) -> np.ndarray:
+    """Vectorized speech_rate_band(), including its gaps between bands"""
+    conditions = []
+    for lower, lower_inclusive, upper, _, _ in SPEECH_RATE_BANDS:
+        condition = wpm >= lower if lower_inclusive else wpm > lower
+        if upper is not None:
+            condition &= wpm <= upper
+        conditions.append(condition)
+    return np.select(conditions, [band[3] for band in SPEECH_RATE_BANDS], default=SPEECH_RATE_FALLBACK[0])
+
+def score_cohort(metrics: CohortInput) -> pd.DataFrame:
+    """
+    Score many submissions from their raw metrics
+    Accepts a DataFrame (or a mapping of column name -> array) with
+    METRIC_COLUMNS and returns one column per rubric criterion plus 'total',
+    on the same index
+    """
+    frame = metrics if isinstance(metrics, pd.DataFrame) else pd.DataFrame(metrics)
+    missing = [column for column in METRIC_COLUMNS if column not in frame]
+    if missing:
+        raise ValueError(f"Missing metric columns: {', '.join(missing)}")
+
+    def column(name):
+        return frame[name].to_numpy(dtype=float)
+
+    speech_rate = speech_rate_points(column('wpm'))
+    if 'duration_seconds' in frame:
+        speech_rate = np.where(column('duration_seconds') == 0, 0, speech_rate)
+
+    # Grammar Score = 1 - min(errors per 100 words / 10, 1)
+    grammar_raw = 1 - np.minimum(column('errors_per_100') / 10, 1)
+    grammar = _at_least(grammar_raw, GRAMMAR_BANDS, GRAMMAR_FALLBACK[0])
+    if 'total_words' in frame:
+        grammar = np.where(column('total_words') == 0, 0, grammar)
+
+    scores = pd.DataFrame({
+        'salutation': frame['salutation'].to_numpy(),
+        'keyword_presence': frame['keyword_presence'].to_numpy(),
+        'flow': frame['flow'].to_numpy(),
+        'speech_rate': speech_rate,
+        'grammar': grammar,
+        'vocabulary': _at_least(column('ttr'), VOCABULARY_BANDS, VOCABULARY_FALLBACK[0]),
+        'filler_words': _at_most(column('filler_word_rate'), CLARITY_BANDS, CLARITY_FALLBACK[0]),
+        'sentiment': _at_least(column('sentiment_score'), ENGAGEMENT_BANDS, ENGAGEMENT_FALLBACK[0]),
+    }, index=frame.index)[CRITERIA]
+
+    # Same section scaling and summation order as combine_scores()
+    total = np.zeros(len(scores))
+    for criteria, weight in SECTIONS.values():
+        section = scores[criteria[0]].to_numpy(dtype=float)
+        for criterion in criteria[1:]:
+            section = section + scores[criterion].to_numpy(dtype=float)
+        total = total + (section / weight) * weight
+    scores['total'] = total
+    return scores
+
+# Cohort columns that are stored metrics (score_metrics / extract_metrics)
+STORED_METRIC_COLUMNS = ['wpm', 'errors_per_100', 'ttr', 'filler_word_rate', 'sentiment_score', 'total_words']
+
+# Content criteria carried over as scored points
+CONTENT_CRITERIA = ['salutation', 'keyword_presence', 'flow']
+
+def metrics_row(evaluation: dict) -> dict:
+    """Flatten an evaluate_transcript() result into one cohort metrics row"""
+    metrics = extract_metrics(evaluation)
+    row = {criterion: evaluation['scores'][criterion] for criterion in CONTENT_CRITERIA}
+    row['duration_seconds'] = evaluation['speech_rate']['metrics']['duration_seconds']
+    row.update((column, metrics[column]) for column in STORED_METRIC_COLUMNS)
+    return row
+
+def metrics_frame(evaluations: Iterable[dict]) -> pd.DataFrame:
+    """Cohort metrics frame for a sequence of evaluate_transcript() results"""
+    return pd.DataFrame([metrics_row(evaluation) for evaluation in evaluations],
+                        columns=METRIC_COLUMNS + OPTIONAL_COLUMNS)
+
+def stored_metrics_frame(batch_size: int = 1000) -> pd.DataFrame:
+    """
+    Cohort metrics frame for the latest stored score of every transcript,
+    indexed by transcript id; scores saved without metrics are left out
+    """
+    from database import iter_score_metrics
+
+    rows = []
+    index = []
+    for transcript_id, duration_seconds, scores, metrics in iter_score_metrics(batch_size):
+        row = {criterion: scores[criterion] for criterion in CONTENT_CRITERIA}
+        row['duration_seconds'] = duration_seconds
+        row.update((column, metrics[column]) for column in STORED_METRIC_COLUMNS)
+        rows.append(row)
+        index.append(transcript_id)
+    return pd.DataFrame(rows, index=pd.Index(index, name='transcript_id'),
+                        columns=METRIC_COLUMNS + OPTIONAL_COLUMNS)
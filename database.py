@@ -1,15 +1,232 @@
+import hashlib
+import os
 import sqlite3
 import json
-from datetime import datetime
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import date, datetime, time, timezone
 from pathlib import Path
 
 DB_PATH = Path(__file__).parent / "speech_scores.db"
 
+# Applied to every new connection. WAL lets readers run alongside a writer,
+# busy_timeout makes writers wait for the lock instead of failing with
+# "database is locked", and synchronous=NORMAL is durable under WAL while
+# avoiding an fsync on every commit.
+CONNECTION_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=30000',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-16000'
+]
+
+# Idle connections kept for reuse per process
+MAX_IDLE_CONNECTIONS = 8
+
+_pool = []
+_pool_key = None
+_pool_lock = threading.Lock()
+
+# Aggregated score columns: key in scores_dict -> (scores column, maximum points)
+SCORE_COLUMNS = {
+    'total': ('total_score', 100),
+    'salutation': ('salutation_score', 5),
+    'keyword_presence': ('keyword_presence_score', 30),
+    'flow': ('flow_score', 5),
+    'speech_rate': ('speech_rate_score', 10),
+    'grammar': ('grammar_score', 10),
+    'vocabulary': ('vocabulary_score', 10),
+    'filler_words': ('filler_word_score', 15),
+    'sentiment': ('sentiment_score', 15)
+}
+
+# Scorer version tag columns of scores, one per criterion (NULL on rows
+# saved before versioning, which count as stale)
+VERSION_COLUMNS = {metric: f'{metric}_version' for metric in SCORE_COLUMNS if metric != 'total'}
+
+# Typed per-evaluation metrics: score_metrics column -> SQL type
+SCORE_METRIC_COLUMNS = {
+    'wpm': 'REAL',
+    'ttr': 'REAL',
+    'distinct_words': 'INTEGER',
+    'total_words': 'INTEGER',
+    'filler_word_rate': 'REAL',
+    'filler_count': 'INTEGER',
+    'grammar_errors': 'INTEGER',
+    'errors_per_100': 'REAL',
+    'sentiment_score': 'REAL'
+}
+
+# Stored feedback is zlib-compressed JSON behind a one-byte format tag. The
+# preset dictionary holds the keys and phrases every feedback dict repeats,
+# most frequent last, so a typical ~650 byte payload stores in ~60 bytes.
+# Rows written with a dictionary must stay readable: never edit it in place,
+# add a new format tag instead.
+FEEDBACK_FORMAT = 1
+FEEDBACK_ZDICT = ' '.join([
+    '"Poor" "Fair" "Good" "Very Good" "Excellent" "Neutral/Mixed" "Negative/Disinterested"',
+    '"Positive/Confident" "Very Positive/Enthusiastic" Basic structure: Few elements present',
+    'Poor flow: Disorganized structure Fair flow: Most elements present, some reordering needed',
+    'No formal salutation found Normal salutation: Basic greeting used',
+    'Excellent salutation: Enthusiastic greeting found Duration not provided Too fast: WPM Fast: Slow:',
+    '"unique_fact", "goal", "strength", "origin" "family", "hobbies"',
+    '{"content": {"salutation": "Good salutation: Proper greeting used", "keywords": {"must_have_found":',
+    '["name", "age", "school_class", "family", "hobbies"], "good_to_have_found": ["unique_fact", "goal",',
+    '"strength", "origin"], "must_have_score": 20, "good_to_have_score": 10}, "flow": "Excellent flow:',
+    'Introduction follows logical structure"}, "speech_rate": "Ideal: 120.0 WPM (ideal: 111-140)",',
+    '"language": {"grammar": "Grammar: Excellent (0 errors found, 0.00 errors per 100 words)",',
+    '"vocabulary": "Vocabulary richness: Very Good (TTR: 0.700)"}, "clarity": "Clarity: Excellent -',
+    'Filler word rate: 0.00% (0 filler words)", "engagement": "Engagement: Good - Sentiment: Mostly',
+    'Positive (Score: 0.500)"}'
+]).encode()
+
+# Transcript text is stored once per distinct content in transcript_blobs,
+# keyed by its SHA-256 and zlib-compressed; transcripts rows reference it by
+# blob_hash and keep an empty transcript column. Rows written by older
+# versions (blob_hash NULL) still hold their text inline until migrated.
+TRANSCRIPT_COMPRESSION_LEVEL = 6
+
+# Full-text index over student names and transcript text. Contentless: the
+# text lives in transcripts/transcript_blobs, and the index rowid is the
+# transcript id. Prefix indexes make partial-name queries ("rav*") as cheap
+# as whole-word ones.
+SEARCH_INDEX_SQL = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts USING fts5(
+        student_name, transcript,
+        content='', prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+    )
+'''
+
+# Searchable columns of transcripts_fts
+SEARCH_COLUMNS = ('student_name', 'transcript')
+
+# Matches ranked per search. bm25 ranking scores every match, so a term
+# found in most transcripts would cost a full index scan; instead only the
+# newest SEARCH_RANK_WINDOW matches are ranked, which keeps common-word
+# queries over millions of rows in milliseconds.
+SEARCH_RANK_WINDOW = 2000
+
+SEARCH_TERM_PATTERN = re.compile(r'"([^"]*)"|(\w+)')
+
+# Attempts averaged in each student's moving average
+MOVING_AVERAGE_WINDOW = 5
+
+# Columns of student_summaries after student_name; recent_scores holds the
+# last MOVING_AVERAGE_WINDOW totals as JSON so each save updates it in O(1)
+STUDENT_SUMMARY_FIELDS = [
+    'attempts', 'first_at', 'latest_at', 'latest_transcript_id', 'latest_score',
+    'best_transcript_id', 'best_score', 'score_sum', 'recent_scores', 'moving_average'
+]
+
+# Equal-width histogram bins over 0..maximum points for every aggregated column
+HISTOGRAM_BINS = 10
+
+# Stored in db_meta 'aggregates_built'; databases with an older value have
+# their statistics rebuilt once (format 2 counts only each transcript's latest score)
+AGGREGATES_FORMAT = 2
+
+_initialized_paths = set()
+_init_lock = threading.Lock()
+
+def _open_connection(path: str) -> sqlite3.Connection:
+    # Autocommit mode: transactions are opened explicitly by transaction()
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+@contextmanager
+def connect():
+    """
+    Borrow a pooled connection to DB_PATH
+    Connections are reused across calls and threads (one user at a time) and
+    never shared across processes: a forked worker starts with an empty pool
+    """
+    global _pool, _pool_key
+    key = (str(DB_PATH), os.getpid())
+    
+    with _pool_lock:
+        if _pool_key != key:
+            # Connections inherited through fork or opened for an old DB_PATH are dropped, not reused
+            _pool, _pool_key = [], key
+        conn = _pool.pop() if _pool else None
+    
+    if conn is None:
+        conn = _open_connection(key[0])
+    
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        with _pool_lock:
+            if _pool_key == key and len(_pool) < MAX_IDLE_CONNECTIONS:
+                _pool.append(conn)
+                conn = None
+        if conn is not None:
+            conn.close()
+
+@contextmanager
+def transaction():
+    """
+    Run the enclosed writes atomically, yielding a cursor
+    BEGIN IMMEDIATE takes the write lock up front so concurrent writers queue
+    on busy_timeout instead of deadlocking when a read upgrades to a write
+    """
+    with connect() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn.cursor()
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+def close_connections():
+    """Close idle pooled connections (e.g. before switching DB_PATH or at shutdown)"""
+    global _pool
+    with _pool_lock:
+        idle, _pool = _pool, []
+    for conn in idle:
+        conn.close()
+
 def init_db():
     """Initialize SQLite database with required tables"""
-    conn = sqlite3.connect(str(DB_PATH))
-    cursor = conn.cursor()
-    
+    with transaction() as cursor:
+        _create_tables(cursor)
+        _ensure_columns(cursor, 'score_metrics', SCORE_METRIC_COLUMNS)
+        _ensure_columns(cursor, 'transcripts', {'blob_hash': 'TEXT'})
+        _ensure_columns(cursor, 'scores', {column: 'TEXT' for column in VERSION_COLUMNS.values()})
+        
+        # Databases created before aggregates existed, or with an older format, get them built once
+        built = cursor.execute("SELECT value FROM db_meta WHERE key = 'aggregates_built'").fetchone()
+        if not built or built[0] < AGGREGATES_FORMAT:
+            _rebuild_aggregates(cursor)
+        
+        # Likewise the per-student summaries
+        summarized = cursor.execute("SELECT value FROM db_meta WHERE key = 'student_summaries_built'").fetchone()
+        if not summarized:
+            _rebuild_student_summaries(cursor)
+        
+        # Likewise the search index for databases created before it existed
+        indexed = cursor.execute("SELECT value FROM db_meta WHERE key = 'search_index_built'").fetchone()
+        if not indexed:
+            _rebuild_search_index(cursor)
+
+def ensure_db():
+    """Run init_db() once per process and database path (cheap to call on every rerun)"""
+    path = str(DB_PATH)
+    if path in _initialized_paths:
+        return
+    with _init_lock:
+        if path not in _initialized_paths:
+            init_db()
+            _initialized_paths.add(path)
+
+def _create_tables(cursor):
     # Create transcripts table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS transcripts (
@@ -54,37 +271,163 @@ def init_db():
         )
     ''')
     
-    conn.commit()
-    conn.close()
-
-def save_transcript(student_name, transcript, word_count, sentence_count, duration_seconds):
-    """Save transcript to database"""
-    conn = sqlite3.connect(str(DB_PATH))
-    cursor = conn.cursor()
+    # Create content-addressed transcript text table
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS transcript_blobs (
+            hash TEXT PRIMARY KEY,
+            content BLOB NOT NULL,
+            size INTEGER NOT NULL
+        ) WITHOUT ROWID
+    ''')
     
+    # Create per-student summaries, maintained in the same transaction as each save
     cursor.execute('''
-        INSERT INTO transcripts (student_name, transcript, word_count, sentence_count, duration_seconds)
-        VALUES (?, ?, ?, ?, ?)
-    ''', (student_name, transcript, word_count, sentence_count, duration_seconds))
+        CREATE TABLE IF NOT EXISTS student_summaries (
+            student_name TEXT PRIMARY KEY,
+            attempts INTEGER NOT NULL,
+            first_at TIMESTAMP,
+            latest_at TIMESTAMP,
+            latest_transcript_id INTEGER,
+            latest_score REAL,
+            best_transcript_id INTEGER,
+            best_score REAL,
+            score_sum REAL NOT NULL,
+            recent_scores TEXT NOT NULL,
+            moving_average REAL
+        )
+    ''')
+    
+    # Create full-text search index
+    cursor.execute(SEARCH_INDEX_SQL)
+    
+    # Create typed metrics table, one row per score
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS score_metrics (
+            score_id INTEGER PRIMARY KEY,
+            FOREIGN KEY (score_id) REFERENCES scores(id)
+        )
+    ''')
+    
+    # Indexes for score lookups per transcript and for paginated, filtered result lists
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_scores_transcript_id ON scores(transcript_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_transcripts_created_at ON transcripts(created_at, id)')
+    cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_transcripts_student_created ON transcripts(student_name, created_at, id)'
+    )
+    
+    # Create metadata table; data_version changes on every write to transcripts/scores
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS db_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO db_meta (key, value) VALUES ('data_version', 0)")
     
-    conn.commit()
+    # Create materialized statistics, maintained in the same transaction as each write
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS score_aggregates (
+            metric TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0,
+            total REAL NOT NULL DEFAULT 0,
+            min_value REAL,
+            max_value REAL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS score_histograms (
+            metric TEXT NOT NULL,
+            bin INTEGER NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (metric, bin)
+        )
+    ''')
+    
+    # Create rescoring job checkpoints (see rescoring.py)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS rescore_jobs (
+            job_id TEXT PRIMARY KEY,
+            target_transcript_id INTEGER NOT NULL,
+            last_transcript_id INTEGER NOT NULL DEFAULT 0,
+            rescored INTEGER NOT NULL DEFAULT 0,
+            failed INTEGER NOT NULL DEFAULT 0,
+            started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    ''')
+    
+    # Create score cache table (persistent tier of score_cache.ScoreCache)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS score_cache (
+            cache_key TEXT PRIMARY KEY,
+            result TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+def _ensure_columns(cursor, table, columns):
+    """Add any missing columns ({name: SQL type}) to an existing table"""
+    existing = {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
+    for name, column_type in columns.items():
+        if name not in existing:
+            cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {column_type}')
+
+def encode_feedback(feedback) -> bytes:
+    """Compress a feedback dict for the detailed_feedback column"""
+    compressor = zlib.compressobj(9, zdict=FEEDBACK_ZDICT)
+    payload = json.dumps(feedback).encode()
+    return bytes([FEEDBACK_FORMAT]) + compressor.compress(payload) + compressor.flush()
+
+def decode_feedback(value):
+    """Expand a stored detailed_feedback value (compressed, or JSON text from older rows)"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return json.loads(value)
+    if value[0] != FEEDBACK_FORMAT:
+        raise ValueError(f"Unknown feedback format: {value[0]}")
+    decompressor = zlib.decompressobj(zdict=FEEDBACK_ZDICT)
+    return json.loads(decompressor.decompress(value[1:]) + decompressor.flush())
+
+def _store_transcript_blob(cursor, transcript):
+    """Store transcript text once per distinct content; returns (hash, stored bytes or 0 if already present)"""
+    raw = transcript.encode()
+    blob_hash = hashlib.sha256(raw).hexdigest()
+    content = zlib.compress(raw, TRANSCRIPT_COMPRESSION_LEVEL)
+    cursor.execute(
+        'INSERT OR IGNORE INTO transcript_blobs (hash, content, size) VALUES (?, ?, ?)',
+        (blob_hash, content, len(raw))
+    )
+    return blob_hash, len(content) if cursor.rowcount else 0
+
+def _decode_transcript(inline_text, content):
+    """Transcript text from its blob, or the inline column for rows not yet migrated"""
+    return zlib.decompress(content).decode() if content is not None else inline_text
+
+def _insert_transcript(cursor, student_name, transcript, word_count, sentence_count, duration_seconds):
+    blob_hash, _ = _store_transcript_blob(cursor, transcript)
+    cursor.execute('''
+        INSERT INTO transcripts (student_name, transcript, blob_hash, word_count, sentence_count, duration_seconds)
+        VALUES (?, '', ?, ?, ?, ?)
+    ''', (student_name, blob_hash, word_count, sentence_count, duration_seconds))
     transcript_id = cursor.lastrowid
-    conn.close()
     
+    cursor.execute(
+        'INSERT INTO transcripts_fts (rowid, student_name, transcript) VALUES (?, ?, ?)',
+        (transcript_id, student_name, transcript)
+    )
     return transcript_id
 
-def save_score(transcript_id, scores_dict, feedback):
-    """Save score to database"""
-    conn = sqlite3.connect(str(DB_PATH))
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        INSERT INTO scores 
-        (transcript_id, salutation_score, keyword_presence_score, flow_score, 
-         speech_rate_score, grammar_score, vocabulary_score, filler_word_score, 
-         sentiment_score, total_score, detailed_feedback)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
+def current_versions():
+    """Scorer version of each criterion, as stamped on newly saved scores"""
+    # Imported here so the database module does not load the scorers
+    from evaluation import CRITERION_VERSIONS
+    return CRITERION_VERSIONS
+
+def _score_params(transcript_id, scores_dict, feedback):
+    versions = current_versions()
+    return (
         transcript_id,
         scores_dict.get('salutation', 0),
         scores_dict.get('keyword_presence', 0),
@@ -95,71 +438,1035 @@ def save_score(transcript_id, scores_dict, feedback):
         scores_dict.get('filler_words', 0),
         scores_dict.get('sentiment', 0),
         scores_dict.get('total', 0),
-        json.dumps(feedback)
-    ))
-    
-    conn.commit()
+        encode_feedback(feedback)
+    ) + tuple(versions[criterion] for criterion in VERSION_COLUMNS)
+
+INSERT_SCORE_SQL = f'''
+    INSERT INTO scores 
+    (transcript_id, salutation_score, keyword_presence_score, flow_score, 
+     speech_rate_score, grammar_score, vocabulary_score, filler_word_score, 
+     sentiment_score, total_score, detailed_feedback, {', '.join(VERSION_COLUMNS.values())})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?{', ?' * len(VERSION_COLUMNS)})
+'''
+
+INSERT_METRICS_SQL = f'''
+    INSERT OR REPLACE INTO score_metrics (score_id, {', '.join(SCORE_METRIC_COLUMNS)})
+    VALUES (?, {', '.join('?' * len(SCORE_METRIC_COLUMNS))})
+'''
+
+def _insert_score(cursor, transcript_id, scores_dict, feedback, metrics=None):
+    cursor.execute(INSERT_SCORE_SQL, _score_params(transcript_id, scores_dict, feedback))
     score_id = cursor.lastrowid
-    conn.close()
-    
+    if metrics:
+        _insert_metrics(cursor, [(score_id, metrics)])
     return score_id
 
-def get_all_transcripts():
-    """Retrieve all transcripts with their scores"""
-    conn = sqlite3.connect(str(DB_PATH))
-    cursor = conn.cursor()
+def _insert_metrics(cursor, metric_rows):
+    """Write (score_id, metrics dict) pairs to score_metrics; missing metrics are stored as NULL"""
+    cursor.executemany(INSERT_METRICS_SQL, [
+        (score_id,) + tuple(metrics.get(name) for name in SCORE_METRIC_COLUMNS)
+        for score_id, metrics in metric_rows
+    ])
+
+def _inserted_ids(cursor, count):
+    """Row ids of the last count rows inserted by executemany (contiguous under the write lock)"""
+    last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+    return list(range(last_id - count + 1, last_id + 1))
+
+def _histogram_bin(value, max_points):
+    return max(0, min(HISTOGRAM_BINS - 1, int(value * HISTOGRAM_BINS / max_points)))
+
+def _accumulate_scores(scores_dicts):
+    """Fold score dicts into per-metric (count, total, min, max) and histogram bin counts"""
+    stats = {}
+    bins = {}
+    for scores_dict in scores_dicts:
+        for metric, (_, max_points) in SCORE_COLUMNS.items():
+            value = scores_dict.get(metric, 0)
+            if value is None:
+                continue
+            count, total, low, high = stats.get(metric, (0, 0.0, value, value))
+            stats[metric] = (count + 1, total + value, min(low, value), max(high, value))
+            key = (metric, _histogram_bin(value, max_points))
+            bins[key] = bins.get(key, 0) + 1
+    return stats, bins
+
+def _write_aggregates(cursor, stats, bins):
+    cursor.executemany('''
+        INSERT INTO score_aggregates (metric, count, total, min_value, max_value)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(metric) DO UPDATE SET
+            count = count + excluded.count,
+            total = total + excluded.total,
+            min_value = MIN(COALESCE(min_value, excluded.min_value), excluded.min_value),
+            max_value = MAX(COALESCE(max_value, excluded.max_value), excluded.max_value)
+    ''', [(metric,) + values for metric, values in stats.items()])
+    cursor.executemany('''
+        INSERT INTO score_histograms (metric, bin, count) VALUES (?, ?, ?)
+        ON CONFLICT(metric, bin) DO UPDATE SET count = count + excluded.count
+    ''', [key + (count,) for key, count in bins.items()])
+
+def _record_scores(cursor, scores_dicts):
+    """Add newly inserted scores to the materialized statistics"""
+    stats, bins = _accumulate_scores(scores_dicts)
+    _write_aggregates(cursor, stats, bins)
+
+def _supersede_scores(cursor, transcript_ids):
+    """
+    Take the current latest score of each transcript out of the materialized
+    statistics, before a newer score for it is inserted and recorded
+    Counts, totals and histograms stay exact; min and max cannot shrink in
+    place, so they may keep a superseded extreme until rebuild_aggregates()
+    """
+    columns = ', '.join(f's.{column}' for column, _ in SCORE_COLUMNS.values())
+    superseded = []
+    for transcript_id in set(transcript_ids):
+        row = cursor.execute(f'''
+            SELECT {columns} FROM scores s
+            WHERE s.id = (SELECT MAX(id) FROM scores WHERE transcript_id = ?)
+        ''', (transcript_id,)).fetchone()
+        if row:
+            superseded.append(dict(zip(SCORE_COLUMNS, row)))
     
+    stats, bins = _accumulate_scores(superseded)
+    cursor.executemany(
+        'UPDATE score_aggregates SET count = count - ?, total = total - ? WHERE metric = ?',
+        [(count, total, metric) for metric, (count, total, _, _) in stats.items()]
+    )
+    cursor.executemany(
+        'UPDATE score_histograms SET count = count - ? WHERE metric = ? AND bin = ?',
+        [(count,) + key for key, count in bins.items()]
+    )
+
+def _add_attempt(summary, transcript_id, created_at, total):
+    """Fold one newer scored attempt into a student summary dict (None for a new student)"""
+    if summary is None:
+        summary = {'attempts': 0, 'first_at': created_at, 'best_score': None, 'score_sum': 0.0, 'recent_scores': []}
+    recent = (summary['recent_scores'] + [total])[-MOVING_AVERAGE_WINDOW:]
+    summary.update({
+        'attempts': summary['attempts'] + 1,
+        'latest_at': created_at,
+        'latest_transcript_id': transcript_id,
+        'latest_score': total,
+        'score_sum': summary['score_sum'] + total,
+        'recent_scores': recent,
+        'moving_average': sum(recent) / len(recent)
+    })
+    if summary['best_score'] is None or total > summary['best_score']:
+        summary['best_score'] = total
+        summary['best_transcript_id'] = transcript_id
+    return summary
+
+def _load_student_summary(cursor, student_name):
+    row = cursor.execute(
+        f"SELECT {', '.join(STUDENT_SUMMARY_FIELDS)} FROM student_summaries WHERE student_name = ?",
+        (student_name,)
+    ).fetchone()
+    if row is None:
+        return None
+    summary = dict(zip(STUDENT_SUMMARY_FIELDS, row))
+    summary['recent_scores'] = json.loads(summary['recent_scores'])
+    return summary
+
+def _write_student_summaries(cursor, summaries):
+    cursor.executemany(f'''
+        INSERT OR REPLACE INTO student_summaries (student_name, {', '.join(STUDENT_SUMMARY_FIELDS)})
+        VALUES (?, {', '.join('?' * len(STUDENT_SUMMARY_FIELDS))})
+    ''', [
+        (student_name,) + tuple(json.dumps(summary[field]) if field == 'recent_scores' else summary[field]
+                                for field in STUDENT_SUMMARY_FIELDS)
+        for student_name, summary in summaries.items()
+    ])
+
+def _record_attempts(cursor, attempts):
+    """
+    Add newly saved evaluations to the student summaries
+    attempts: (student_name, transcript_id, scores_dict) in insertion order
+    """
+    summaries = {}
+    for student_name, transcript_id, scores_dict in attempts:
+        if student_name not in summaries:
+            summaries[student_name] = _load_student_summary(cursor, student_name)
+        created_at = cursor.execute('SELECT created_at FROM transcripts WHERE id = ?', (transcript_id,)).fetchone()[0]
+        summaries[student_name] = _add_attempt(
+            summaries[student_name], transcript_id, created_at, scores_dict.get('total', 0)
+        )
+    _write_student_summaries(cursor, summaries)
+
+def _refresh_student_summaries(cursor, student_names):
+    """Recompute summaries from history, for students whose earlier attempts were rescored"""
+    summaries = {}
+    for student_name in student_names:
+        summary = None
+        for transcript_id, created_at, total in cursor.execute('''
+            SELECT t.id, t.created_at, s.total_score
+            FROM transcripts t
+            JOIN scores s ON s.id = (
+                SELECT MAX(id) FROM scores WHERE transcript_id = t.id
+            )
+            WHERE t.student_name = ?
+            ORDER BY t.created_at, t.id
+        ''', (student_name,)).fetchall():
+            summary = _add_attempt(summary, transcript_id, created_at, total)
+        if summary is None:
+            cursor.execute('DELETE FROM student_summaries WHERE student_name = ?', (student_name,))
+        else:
+            summaries[student_name] = summary
+    _write_student_summaries(cursor, summaries)
+
+def _rescored_students(cursor, transcript_ids):
+    """Names of the students owning the given transcripts"""
+    names = set()
+    for transcript_id in set(transcript_ids):
+        row = cursor.execute('SELECT student_name FROM transcripts WHERE id = ?', (transcript_id,)).fetchone()
+        if row:
+            names.add(row[0])
+    return names
+
+def _rebuild_student_summaries(cursor):
+    cursor.execute('DELETE FROM student_summaries')
+    students = [row[0] for row in cursor.execute('SELECT DISTINCT student_name FROM transcripts').fetchall()]
+    _refresh_student_summaries(cursor, students)
+    cursor.execute("INSERT OR REPLACE INTO db_meta (key, value) VALUES ('student_summaries_built', 1)")
+
+def rebuild_student_summaries():
+    """Recompute every student summary from the stored scores"""
+    with transaction() as cursor:
+        _rebuild_student_summaries(cursor)
+        _bump_data_version(cursor)
+
+def _record_transcripts(cursor, count):
     cursor.execute('''
-        SELECT t.id, t.student_name, t.created_at, s.total_score
+        INSERT INTO score_aggregates (metric, count) VALUES ('transcripts', ?)
+        ON CONFLICT(metric) DO UPDATE SET count = count + excluded.count
+    ''', (count,))
+
+def _rebuild_aggregates(cursor, batch_size=5000):
+    cursor.execute('DELETE FROM score_aggregates')
+    cursor.execute('DELETE FROM score_histograms')
+    
+    # Only each transcript's latest score counts; rescored rows replace the old ones
+    metrics = list(SCORE_COLUMNS)
+    columns = ', '.join(f's.{column}' for column, _ in SCORE_COLUMNS.values())
+    rows = cursor.connection.execute(f'''
+        SELECT {columns}
         FROM transcripts t
-        LEFT JOIN scores s ON t.id = s.transcript_id
-        ORDER BY t.created_at DESC
+        JOIN scores s ON s.id = (
+            SELECT MAX(id) FROM scores WHERE transcript_id = t.id
+        )
     ''')
+    stats = {}
+    bins = {}
+    while True:
+        batch = rows.fetchmany(batch_size)
+        if not batch:
+            break
+        batch_stats, batch_bins = _accumulate_scores(dict(zip(metrics, row)) for row in batch)
+        for metric, (count, total, low, high) in batch_stats.items():
+            if metric in stats:
+                old_count, old_total, old_low, old_high = stats[metric]
+                stats[metric] = (old_count + count, old_total + total, min(old_low, low), max(old_high, high))
+            else:
+                stats[metric] = (count, total, low, high)
+        for key, count in batch_bins.items():
+            bins[key] = bins.get(key, 0) + count
     
-    results = cursor.fetchall()
-    conn.close()
-    
-    return results
+    _write_aggregates(cursor, stats, bins)
+    _record_transcripts(cursor, cursor.execute('SELECT COUNT(*) FROM transcripts').fetchone()[0])
+    cursor.execute("INSERT OR REPLACE INTO db_meta (key, value) VALUES ('aggregates_built', ?)", (AGGREGATES_FORMAT,))
 
-def get_transcript_details(transcript_id):
-    """Get transcript and score details by ID"""
-    conn = sqlite3.connect(str(DB_PATH))
-    cursor = conn.cursor()
+def _rebuild_search_index(cursor, batch_size=1000):
+    cursor.execute('DROP TABLE IF EXISTS transcripts_fts')
+    cursor.execute(SEARCH_INDEX_SQL)
     
-    cursor.execute('''
-        SELECT t.*, s.*
+    rows = cursor.connection.execute('''
+        SELECT t.id, t.student_name, t.transcript, b.content
         FROM transcripts t
-        LEFT JOIN scores s ON t.id = s.transcript_id
-        WHERE t.id = ?
-    ''', (transcript_id,))
+        LEFT JOIN transcript_blobs b ON b.hash = t.blob_hash
+    ''')
+    while True:
+        batch = rows.fetchmany(batch_size)
+        if not batch:
+            break
+        cursor.executemany(
+            'INSERT INTO transcripts_fts (rowid, student_name, transcript) VALUES (?, ?, ?)',
+            [(transcript_id, student_name, _decode_transcript(inline_text, content))
+             for transcript_id, student_name, inline_text, content in batch]
+        )
+    cursor.execute("INSERT OR REPLACE INTO db_meta (key, value) VALUES ('search_index_built', 1)")
+
+def rebuild_search_index():
+    """Re-index every transcript for full-text search"""
+    with transaction() as cursor:
+        _rebuild_search_index(cursor)
+
+def rebuild_aggregates():
+    """Recompute the materialized statistics from each transcript's latest score"""
+    with transaction() as cursor:
+        _rebuild_aggregates(cursor)
+        _bump_data_version(cursor)
+
+def _bump_data_version(cursor):
+    cursor.execute("UPDATE db_meta SET value = value + 1 WHERE key = 'data_version'")
+
+def get_data_version():
+    """
+    Counter that changes whenever transcripts or scores are written, by any
+    process; query caches keyed on it are invalidated by new evaluations
+    """
+    with connect() as conn:
+        row = conn.execute("SELECT value FROM db_meta WHERE key = 'data_version'").fetchone()
+    return row[0] if row else 0
+
+def save_transcript(student_name, transcript, word_count, sentence_count, duration_seconds):
+    """Save transcript to database"""
+    with transaction() as cursor:
+        transcript_id = _insert_transcript(
+            cursor, student_name, transcript, word_count, sentence_count, duration_seconds
+        )
+        _record_transcripts(cursor, 1)
+        _bump_data_version(cursor)
     
-    result = cursor.fetchone()
-    conn.close()
+    return transcript_id
+
+def save_score(transcript_id, scores_dict, feedback, metrics=None):
+    """Save score (and optionally its numeric metrics) to database"""
+    with transaction() as cursor:
+        _supersede_scores(cursor, [transcript_id])
+        score_id = _insert_score(cursor, transcript_id, scores_dict, feedback, metrics)
+        _record_scores(cursor, [scores_dict])
+        _refresh_student_summaries(cursor, _rescored_students(cursor, [transcript_id]))
+        _bump_data_version(cursor)
     
-    return result
+    return score_id
 
-def get_statistics():
-    """Get overall statistics"""
-    conn = sqlite3.connect(str(DB_PATH))
-    cursor = conn.cursor()
+def save_evaluation(student_name, transcript, word_count, sentence_count, duration_seconds,
+                    scores_dict, feedback, metrics=None):
+    """
+    Save a transcript and its score (plus optional metrics) in one transaction
+    Returns (transcript_id, score_id); either all rows are written or none
+    """
+    with transaction() as cursor:
+        transcript_id = _insert_transcript(
+            cursor, student_name, transcript, word_count, sentence_count, duration_seconds
+        )
+        score_id = _insert_score(cursor, transcript_id, scores_dict, feedback, metrics)
+        _record_transcripts(cursor, 1)
+        _record_scores(cursor, [scores_dict])
+        _record_attempts(cursor, [(student_name, transcript_id, scores_dict)])
+        _bump_data_version(cursor)
+    
+    return transcript_id, score_id
+
+def save_scores_many(score_rows):
+    """
+    Bulk-insert scores in one transaction
+    score_rows: iterable of (transcript_id, scores_dict, feedback) or
+    (transcript_id, scores_dict, feedback, metrics)
+    Returns the new score ids in input order
+    """
+    with transaction() as cursor:
+        return _insert_scores_many(cursor, list(score_rows))
+
+def _insert_scores_many(cursor, score_rows):
+    _supersede_scores(cursor, [row[0] for row in score_rows])
+    cursor.executemany(INSERT_SCORE_SQL, [_score_params(*row[:3]) for row in score_rows])
+    score_ids = _inserted_ids(cursor, len(score_rows))
+    _insert_metrics(cursor, [
+        (score_id, row[3]) for score_id, row in zip(score_ids, score_rows) if len(row) > 3 and row[3]
+    ])
+    # Of several rows for one transcript only the last is its latest score
+    latest = {row[0]: row[1] for row in score_rows}
+    _record_scores(cursor, list(latest.values()))
+    _refresh_student_summaries(cursor, _rescored_students(cursor, [row[0] for row in score_rows]))
+    _bump_data_version(cursor)
+    return score_ids
+
+def save_evaluations_many(evaluations):
+    """
+    Bulk-save evaluations in one transaction
+    evaluations: iterable of dicts with student_name, transcript, word_count,
+    sentence_count, duration_seconds, scores, feedback and optionally metrics
+    Returns the new transcript ids in input order
+    """
+    transcript_ids = []
+    score_params = []
+    scores_dicts = []
+    metrics = []
+    attempts = []
+    
+    with transaction() as cursor:
+        for evaluation in evaluations:
+            # Transcript ids are needed for the score rows, so these insert one at a time
+            transcript_id = _insert_transcript(
+                cursor, evaluation['student_name'], evaluation['transcript'], evaluation['word_count'],
+                evaluation['sentence_count'], evaluation['duration_seconds']
+            )
+            transcript_ids.append(transcript_id)
+            score_params.append(_score_params(transcript_id, evaluation['scores'], evaluation['feedback']))
+            scores_dicts.append(evaluation['scores'])
+            metrics.append(evaluation.get('metrics'))
+            attempts.append((evaluation['student_name'], transcript_id, evaluation['scores']))
+        
+        cursor.executemany(INSERT_SCORE_SQL, score_params)
+        score_ids = _inserted_ids(cursor, len(score_params))
+        _insert_metrics(cursor, [
+            (score_id, score_metrics) for score_id, score_metrics in zip(score_ids, metrics) if score_metrics
+        ])
+        _record_transcripts(cursor, len(transcript_ids))
+        _record_scores(cursor, scores_dicts)
+        _record_attempts(cursor, attempts)
+        _bump_data_version(cursor)
+    
+    return transcript_ids
+
+def get_all_transcripts():
+    """Retrieve all transcripts with their scores"""
+    with connect() as conn:
+        return conn.execute('''
+            SELECT t.id, t.student_name, t.created_at, s.total_score
+            FROM transcripts t
+            LEFT JOIN scores s ON t.id = s.transcript_id
+            ORDER BY t.created_at DESC
+        ''').fetchall()
+
+def _date_bound(value, end_of_day=False):
+    """
+    Convert a date/datetime/str bound to the created_at text format
+    created_at holds UTC (CURRENT_TIMESTAMP), while dates and naive datetimes are
+    local time, so they are converted: a date covers the whole local day.
+    Strings are passed through as UTC timestamps
+    """
+    if value is None:
+        return None
+    if not isinstance(value, datetime) and isinstance(value, date):
+        value = datetime.combine(value, time(23, 59, 59) if end_of_day else time.min)
+    if isinstance(value, datetime):
+        # astimezone() treats a naive datetime as local time
+        return value.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+def _transcript_filters(student_name=None, date_from=None, date_to=None):
+    """SQL conditions and parameters restricting transcripts t by student and date range"""
+    conditions = []
+    params = []
+    
+    if student_name:
+        conditions.append('t.student_name = ?')
+        params.append(student_name)
+    if date_from is not None:
+        conditions.append('t.created_at >= ?')
+        params.append(_date_bound(date_from))
+    if date_to is not None:
+        conditions.append('t.created_at <= ?')
+        params.append(_date_bound(date_to, end_of_day=True))
+    
+    return conditions, params
+
+def get_results_page(limit=50, cursor=None, student_name=None, date_from=None, date_to=None):
+    """
+    One page of evaluations, newest first, using keyset pagination
+    cursor: the 'next_cursor' of the previous page, or None for the first page
+    student_name: exact name; date_from/date_to: inclusive dates or datetimes
+    Returns {'rows': [(id, student_name, created_at, total_score), ...], 'next_cursor': ...}
+    where next_cursor is None on the last page. Each transcript appears once,
+    with its latest score.
+    """
+    conditions, params = _transcript_filters(student_name, date_from, date_to)
+    if cursor is not None:
+        conditions.append('(t.created_at, t.id) < (?, ?)')
+        params.extend(cursor)
+    
+    where = ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+    
+    with connect() as conn:
+        rows = conn.execute(f'''
+            SELECT t.id, t.student_name, t.created_at, s.total_score
+            FROM transcripts t
+            LEFT JOIN scores s ON s.id = (
+                SELECT MAX(id) FROM scores WHERE transcript_id = t.id
+            )
+            {where}
+            ORDER BY t.created_at DESC, t.id DESC
+            LIMIT ?
+        ''', params + [limit + 1]).fetchall()
+    
+    # One extra row tells us whether another page exists
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = (rows[-1][2], rows[-1][0])
+    
+    return {'rows': rows, 'next_cursor': next_cursor}
+
+def _search_query(text, column=None):
+    """
+    Turn free text into an FTS5 query: "quoted text" is matched as a phrase,
+    other words as prefixes, and every part must match
+    """
+    parts = []
+    for phrase, word in SEARCH_TERM_PATTERN.findall(text):
+        if phrase.strip():
+            parts.append('"' + phrase.replace('"', '') + '"')
+        elif word:
+            parts.append(f'"{word}"*')
+    if not parts:
+        return None
+    query = ' '.join(parts)
+    return f'{column} : ({query})' if column else query
+
+def search_transcripts(text, limit=50, column=None, cursor=None, order='rank',
+                       student_name=None, date_from=None, date_to=None):
+    """
+    Full-text search over student names and transcript text, one page at a time
+    order: 'rank' for best matches first, among the newest SEARCH_RANK_WINDOW
+    matches; 'newest' for every match, newest first
+    cursor: the 'next_cursor' of the previous page, or None for the first page
+    column: restrict matching to one of SEARCH_COLUMNS
+    student_name, date_from, date_to: the get_results_page() filters
+    Returns {'rows': [(id, student_name, created_at, total_score), ...],
+    'next_cursor': ..., 'truncated': ...} like get_results_page(), with each
+    transcript's latest score; truncated is True when 'rank' order left out
+    older matches beyond the window
+    """
+    if column is not None and column not in SEARCH_COLUMNS:
+        raise ValueError(f"Unknown search column: {column}")
+    if order not in ('rank', 'newest'):
+        raise ValueError(f"Unknown search order: {order}")
+    query = _search_query(text, column)
+    if query is None:
+        return {'rows': [], 'next_cursor': None, 'truncated': False}
+    
+    # Filters are applied to the matches themselves, so windows and pages count filtered rows
+    conditions, filter_params = _transcript_filters(student_name, date_from, date_to)
+    join = 'JOIN transcripts t ON t.id = transcripts_fts.rowid' if conditions else ''
+    filters = ''.join(f' AND {condition}' for condition in conditions)
+    match_params = [query] + filter_params
+    
+    truncated = False
+    with connect() as conn:
+        if order == 'newest':
+            # Index entries are in rowid order, so newest-first pages are short scans
+            keyset = 'AND transcripts_fts.rowid < ?' if cursor is not None else ''
+            matches = f'''
+                SELECT transcripts_fts.rowid AS rowid, NULL AS rank FROM transcripts_fts {join}
+                WHERE transcripts_fts MATCH ?{filters} {keyset}
+                ORDER BY transcripts_fts.rowid DESC
+                LIMIT ?
+            '''
+            params = match_params + list(cursor or ()) + [limit + 1]
+            ordering = 'f.rowid DESC'
+        else:
+            # Ranking every match of a common word is slow, so only the newest
+            # SEARCH_RANK_WINDOW are ranked; finding the oldest of them is a short scan
+            bound = conn.execute(f'''
+                SELECT transcripts_fts.rowid FROM transcripts_fts {join}
+                WHERE transcripts_fts MATCH ?{filters}
+                ORDER BY transcripts_fts.rowid DESC LIMIT 1 OFFSET ?
+            ''', match_params + [SEARCH_RANK_WINDOW - 1]).fetchone()
+            if bound:
+                truncated = conn.execute(f'''
+                    SELECT 1 FROM transcripts_fts {join}
+                    WHERE transcripts_fts MATCH ?{filters} AND transcripts_fts.rowid < ? LIMIT 1
+                ''', match_params + [bound[0]]).fetchone() is not None
+            
+            keyset = 'AND (transcripts_fts.rank, transcripts_fts.rowid) > (?, ?)' if cursor is not None else ''
+            matches = f'''
+                SELECT transcripts_fts.rowid AS rowid, transcripts_fts.rank AS rank FROM transcripts_fts {join}
+                WHERE transcripts_fts MATCH ?{filters} AND transcripts_fts.rowid >= ? {keyset}
+                ORDER BY transcripts_fts.rank, transcripts_fts.rowid
+                LIMIT ?
+            '''
+            params = match_params + [bound[0] if bound else 0] + list(cursor or ()) + [limit + 1]
+            ordering = 'f.rank, f.rowid'
+        
+        rows = conn.execute(f'''
+            SELECT t.id, t.student_name, t.created_at, s.total_score, f.rank
+            FROM ({matches}) f
+            JOIN transcripts t ON t.id = f.rowid
+            LEFT JOIN scores s ON s.id = (
+                SELECT MAX(id) FROM scores WHERE transcript_id = t.id
+            )
+            ORDER BY {ordering}
+        ''', params).fetchall()
     
-    cursor.execute('SELECT COUNT(*) FROM transcripts')
-    total_transcripts = cursor.fetchone()[0]
+    # One extra row tells us whether another page exists
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = (last[0],) if order == 'newest' else (last[4], last[0])
     
-    cursor.execute('SELECT AVG(total_score) FROM scores')
-    avg_score = cursor.fetchone()[0]
+    return {'rows': [row[:4] for row in rows], 'next_cursor': next_cursor, 'truncated': truncated}
+
+def get_transcript_details(transcript_id):
+    """
+    Get a transcript with its latest score, decoded feedback and metrics by ID
+    Returns a dict (None if the transcript does not exist) with the transcript
+    fields, 'score_id', 'scores' keyed like scores_dict, 'feedback' and 'metrics'
+    """
+    score_columns = ', '.join(f's.{column}' for column, _ in SCORE_COLUMNS.values())
+    metric_columns = ', '.join(f'm.{name}' for name in SCORE_METRIC_COLUMNS)
+    with connect() as conn:
+        row = conn.execute(f'''
+            SELECT t.id, t.student_name, t.transcript, t.word_count, t.sentence_count,
+                   t.duration_seconds, t.created_at, b.content, s.id, s.detailed_feedback,
+                   {score_columns}, {metric_columns}
+            FROM transcripts t
+            LEFT JOIN transcript_blobs b ON b.hash = t.blob_hash
+            LEFT JOIN scores s ON s.id = (
+                SELECT MAX(id) FROM scores WHERE transcript_id = t.id
+            )
+            LEFT JOIN score_metrics m ON m.score_id = s.id
+            WHERE t.id = ?
+        ''', (transcript_id,)).fetchone()
     
-    cursor.execute('SELECT MAX(total_score) FROM scores')
-    max_score = cursor.fetchone()[0]
+    if row is None:
+        return None
     
-    cursor.execute('SELECT MIN(total_score) FROM scores')
-    min_score = cursor.fetchone()[0]
+    fields = ('id', 'student_name', 'transcript', 'word_count', 'sentence_count',
+              'duration_seconds', 'created_at')
+    details = dict(zip(fields, row))
+    details['transcript'] = _decode_transcript(row[2], row[7])
+    score_id, feedback = row[8], row[9]
+    score_values = row[10:10 + len(SCORE_COLUMNS)]
+    metric_values = row[10 + len(SCORE_COLUMNS):]
+    details['score_id'] = score_id
+    details['scores'] = dict(zip(SCORE_COLUMNS, score_values)) if score_id is not None else None
+    details['feedback'] = decode_feedback(feedback)
+    details['metrics'] = (dict(zip(SCORE_METRIC_COLUMNS, metric_values))
+                          if any(value is not None for value in metric_values) else None)
+    return details
+
+# Columns of iter_score_batches() rows, before the criteria, feedback and metrics
+EXPORT_FIELDS = ['score_id', 'transcript_id', 'student_name', 'created_at', 'scored_at',
+                 'word_count', 'sentence_count', 'duration_seconds']
+
+def iter_score_batches(batch_size=1000, student_name=None, date_from=None, date_to=None):
+    """
+    Yield every score with its transcript fields as lists of at most batch_size
+    dicts, in score order: EXPORT_FIELDS, one key per SCORE_COLUMNS entry,
+    the decoded 'feedback' and the SCORE_METRIC_COLUMNS (None if not stored)
+    Rows are fetched batch by batch, so memory does not grow with the table
+    """
+    conditions, params = _transcript_filters(student_name, date_from, date_to)
+    where = ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+    score_columns = ', '.join(f's.{column}' for column, _ in SCORE_COLUMNS.values())
+    metric_columns = ', '.join(f'm.{name}' for name in SCORE_METRIC_COLUMNS)
+    keys = EXPORT_FIELDS + list(SCORE_COLUMNS) + ['feedback'] + list(SCORE_METRIC_COLUMNS)
+    feedback_index = len(EXPORT_FIELDS) + len(SCORE_COLUMNS)
     
-    conn.close()
+    with connect() as conn:
+        cursor = conn.execute(f'''
+            SELECT s.id, t.id, t.student_name, t.created_at, s.created_at,
+                   t.word_count, t.sentence_count, t.duration_seconds,
+                   {score_columns}, s.detailed_feedback, {metric_columns}
+            FROM scores s
+            JOIN transcripts t ON t.id = s.transcript_id
+            LEFT JOIN score_metrics m ON m.score_id = s.id
+            {where}
+            ORDER BY s.id
+        ''', params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            batch = []
+            for row in rows:
+                record = dict(zip(keys, row))
+                record['feedback'] = decode_feedback(row[feedback_index])
+                batch.append(record)
+            yield batch
+
+def iter_score_metrics(batch_size=1000):
+    """
+    Yield (transcript_id, duration_seconds, scores_dict, metrics) for the
+    latest score of every transcript that has stored metrics, in transcript order
+    """
+    score_columns = ', '.join(f's.{column}' for column, _ in SCORE_COLUMNS.values())
+    metric_columns = ', '.join(f'm.{name}' for name in SCORE_METRIC_COLUMNS)
+    with connect() as conn:
+        cursor = conn.execute(f'''
+            SELECT t.id, t.duration_seconds, {score_columns}, {metric_columns}
+            FROM transcripts t
+            JOIN scores s ON s.id = (
+                SELECT MAX(id) FROM scores WHERE transcript_id = t.id
+            )
+            JOIN score_metrics m ON m.score_id = s.id
+            ORDER BY t.id
+        ''')
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for row in rows:
+                yield (row[0], row[1],
+                       dict(zip(SCORE_COLUMNS, row[2:2 + len(SCORE_COLUMNS)])),
+                       dict(zip(SCORE_METRIC_COLUMNS, row[2 + len(SCORE_COLUMNS):])))
+
+def get_student_summary(student_name):
+    """
+    Cached summary of one student's scored attempts (constant time), or None
+    Returns {'student_name', 'attempts', 'first_at', 'latest_at', 'latest_score',
+    'best_score', 'average_score', 'moving_average', ...}; moving_average is
+    over the last MOVING_AVERAGE_WINDOW attempts
+    """
+    with connect() as conn:
+        summary = _load_student_summary(conn.cursor(), student_name)
+    if summary is None:
+        return None
+    summary['student_name'] = student_name
+    summary['average_score'] = summary['score_sum'] / summary['attempts']
+    return summary
+
+def get_student_history(student_name, limit=None):
+    """
+    One student's scored attempts in chronological order, each with its latest score
+    limit: only the most recent attempts (an index range scan, so the cost
+    does not grow with the student's total attempts)
+    Returns [{'transcript_id', 'created_at', <SCORE_COLUMNS keys>}, ...]
+    """
+    score_columns = ', '.join(f's.{column}' for column, _ in SCORE_COLUMNS.values())
+    with connect() as conn:
+        rows = conn.execute(f'''
+            SELECT t.id, t.created_at, {score_columns}
+            FROM transcripts t
+            JOIN scores s ON s.id = (
+                SELECT MAX(id) FROM scores WHERE transcript_id = t.id
+            )
+            WHERE t.student_name = ?
+            ORDER BY t.created_at DESC, t.id DESC
+            LIMIT ?
+        ''', (student_name, -1 if limit is None else limit)).fetchall()
+    
+    keys = ['transcript_id', 'created_at'] + list(SCORE_COLUMNS)
+    return [dict(zip(keys, row)) for row in reversed(rows)]
+
+def get_statistics():
+    """Get overall statistics (read from the materialized aggregates, constant time)"""
+    with connect() as conn:
+        rows = conn.execute(
+            "SELECT metric, count, total, min_value, max_value FROM score_aggregates "
+            "WHERE metric IN ('transcripts', 'total')"
+        ).fetchall()
+    aggregates = {metric: (count, total, low, high) for metric, count, total, low, high in rows}
+    
+    total_transcripts = aggregates.get('transcripts', (0,))[0]
+    score_count, score_total, min_score, max_score = aggregates.get('total', (0, 0, None, None))
     
     return {
         'total_transcripts': total_transcripts,
-        'average_score': avg_score,
+        'average_score': score_total / score_count if score_count else None,
         'max_score': max_score,
         'min_score': min_score
     }
+
+def get_score_aggregates():
+    """
+    Per-metric statistics for the total and every criterion
+    Returns {metric: {'count', 'average', 'min', 'max', 'max_points', 'histogram'}}
+    where histogram holds HISTOGRAM_BINS counts over 0..max_points
+    """
+    with connect() as conn:
+        rows = conn.execute('SELECT metric, count, total, min_value, max_value FROM score_aggregates').fetchall()
+        bins = conn.execute('SELECT metric, bin, count FROM score_histograms').fetchall()
+    
+    result = {}
+    for metric, count, total, low, high in rows:
+        if metric not in SCORE_COLUMNS:
+            continue
+        result[metric] = {
+            'count': count,
+            'average': total / count if count else None,
+            'min': low,
+            'max': high,
+            'max_points': SCORE_COLUMNS[metric][1],
+            'histogram': [0] * HISTOGRAM_BINS
+        }
+    for metric, bin_index, count in bins:
+        if metric in result:
+            result[metric]['histogram'][bin_index] = count
+    
+    return result
+
+def get_cached_result(cache_key):
+    """Return the cached evaluation JSON for a key, or None"""
+    with connect() as conn:
+        row = conn.execute('SELECT result FROM score_cache WHERE cache_key = ?', (cache_key,)).fetchone()
+    return row[0] if row else None
+
+def save_cached_result(cache_key, result_json):
+    """Store an evaluation JSON under its cache key"""
+    with transaction() as cursor:
+        cursor.execute(
+            'INSERT OR REPLACE INTO score_cache (cache_key, result) VALUES (?, ?)',
+            (cache_key, result_json)
+        )
+
+def clear_score_cache():
+    """Remove every persisted cache entry"""
+    with transaction() as cursor:
+        cursor.execute('DELETE FROM score_cache')
+
+def save_evaluation_metrics(score_id, metrics):
+    """Store (metric_name, metric_value) pairs for a score in evaluation_metrics"""
+    with transaction() as cursor:
+        cursor.executemany(
+            'INSERT INTO evaluation_metrics (score_id, metric_name, metric_value) VALUES (?, ?, ?)',
+            [(score_id, name, value) for name, value in metrics]
+        )
+
+def iter_evaluation_metrics(name_prefix=None, batch_size=1000):
+    """Yield (score_id, metric_name, metric_value) rows, optionally for names with a prefix"""
+    query = 'SELECT score_id, metric_name, metric_value FROM evaluation_metrics'
+    params = ()
+    if name_prefix:
+        query += ' WHERE substr(metric_name, 1, ?) = ?'
+        params = (len(name_prefix), name_prefix)
+    
+    with connect() as conn:
+        cursor = conn.execute(query + ' ORDER BY id', params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+
+def vacuum_db():
+    """Rebuild the database file to release free pages, checkpointing the WAL so the file shrinks now"""
+    with connect() as conn:
+        conn.execute('VACUUM')
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+def compact_feedback(batch_size=500, vacuum=False):
+    """
+    Rewrite detailed_feedback stored as JSON text by older versions in the
+    compressed format, batch_size rows per transaction
+    Returns {'rows', 'bytes_before', 'bytes_after'} for the rewritten rows;
+    with vacuum, the database file is rebuilt afterwards to release the space
+    """
+    report = {'rows': 0, 'bytes_before': 0, 'bytes_after': 0}
+    last_id = 0
+    while True:
+        with transaction() as cursor:
+            rows = cursor.execute('''
+                SELECT id, detailed_feedback FROM scores
+                WHERE id > ? AND typeof(detailed_feedback) = 'text'
+                ORDER BY id LIMIT ?
+            ''', (last_id, batch_size)).fetchall()
+            if not rows:
+                break
+            updates = [(encode_feedback(json.loads(text)), score_id) for score_id, text in rows]
+            cursor.executemany('UPDATE scores SET detailed_feedback = ? WHERE id = ?', updates)
+        
+        last_id = rows[-1][0]
+        report['rows'] += len(rows)
+        report['bytes_before'] += sum(len(text.encode()) for _, text in rows)
+        report['bytes_after'] += sum(len(blob) for blob, _ in updates)
+    
+    if vacuum:
+        vacuum_db()
+    return report
+
+def migrate_transcript_blobs(batch_size=500, vacuum=False):
+    """
+    Move transcript text stored inline by older versions into transcript_blobs,
+    batch_size rows per transaction
+    Returns {'rows', 'blobs', 'bytes_before', 'bytes_after'}: bytes_before is
+    the inline text moved, bytes_after the compressed blobs added for it
+    """
+    report = {'rows': 0, 'blobs': 0, 'bytes_before': 0, 'bytes_after': 0}
+    last_id = 0
+    while True:
+        with transaction() as cursor:
+            rows = cursor.execute('''
+                SELECT id, transcript FROM transcripts
+                WHERE id > ? AND blob_hash IS NULL
+                ORDER BY id LIMIT ?
+            ''', (last_id, batch_size)).fetchall()
+            if not rows:
+                break
+            updates = []
+            for transcript_id, transcript in rows:
+                blob_hash, stored = _store_transcript_blob(cursor, transcript)
+                updates.append((blob_hash, transcript_id))
+                report['blobs'] += stored > 0
+                report['bytes_after'] += stored
+                report['bytes_before'] += len(transcript.encode())
+            cursor.executemany("UPDATE transcripts SET blob_hash = ?, transcript = '' WHERE id = ?", updates)
+        
+        last_id = rows[-1][0]
+        report['rows'] += len(rows)
+    
+    if vacuum:
+        vacuum_db()
+    return report
+
+RESCORE_JOB_FIELDS = ['job_id', 'target_transcript_id', 'last_transcript_id', 'rescored', 'failed',
+                      'started_at', 'updated_at', 'finished_at']
+
+def get_rescore_job(job_id):
+    """Checkpoint of a rescoring job as a dict, or None if it never ran"""
+    with connect() as conn:
+        row = conn.execute(
+            f"SELECT {', '.join(RESCORE_JOB_FIELDS)} FROM rescore_jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+    return dict(zip(RESCORE_JOB_FIELDS, row)) if row else None
+
+def start_rescore_job(job_id, restart=False):
+    """
+    Create a rescoring job covering every transcript stored so far, or return
+    the existing checkpoint so an interrupted job resumes; restart discards it
+    """
+    with transaction() as cursor:
+        if restart:
+            cursor.execute('DELETE FROM rescore_jobs WHERE job_id = ?', (job_id,))
+        cursor.execute('''
+            INSERT OR IGNORE INTO rescore_jobs (job_id, target_transcript_id)
+            SELECT ?, COALESCE(MAX(id), 0) FROM transcripts
+        ''', (job_id,))
+    return get_rescore_job(job_id)
+
+def get_transcript_batch(after_id, upto_id, limit):
+    """
+    Up to limit transcripts with after_id < id <= upto_id, in id order, as
+    (id, transcript, word_count, duration_seconds) tuples
+    Each call is a short keyset query, so no read transaction stays open
+    between batches
+    """
+    with connect() as conn:
+        rows = conn.execute('''
+            SELECT t.id, t.transcript, b.content, t.word_count, t.duration_seconds
+            FROM transcripts t
+            LEFT JOIN transcript_blobs b ON b.hash = t.blob_hash
+            WHERE t.id > ? AND t.id <= ?
+            ORDER BY t.id
+            LIMIT ?
+        ''', (after_id, upto_id, limit)).fetchall()
+    return [(transcript_id, _decode_transcript(inline_text, content), word_count, duration_seconds)
+            for transcript_id, inline_text, content, word_count, duration_seconds in rows]
+
+def count_transcripts_between(after_id, upto_id):
+    """Number of transcripts with after_id < id <= upto_id"""
+    with connect() as conn:
+        return conn.execute(
+            'SELECT COUNT(*) FROM transcripts WHERE id > ? AND id <= ?', (after_id, upto_id)
+        ).fetchone()[0]
+
+def save_rescored_batch(job_id, score_rows, last_transcript_id, failed=0):
+    """
+    Insert a batch of new scores (rows as for save_scores_many) and advance the
+    job checkpoint to last_transcript_id in the same transaction, so a batch is
+    either fully recorded or retried on resume
+    """
+    score_rows = list(score_rows)
+    with transaction() as cursor:
+        _insert_scores_many(cursor, score_rows)
+        cursor.execute('''
+            UPDATE rescore_jobs
+            SET last_transcript_id = ?, rescored = rescored + ?, failed = failed + ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE job_id = ?
+        ''', (last_transcript_id, len(score_rows), failed, job_id))
+
+def finish_rescore_job(job_id):
+    """Mark a rescoring job as complete"""
+    with transaction() as cursor:
+        cursor.execute(
+            'UPDATE rescore_jobs SET finished_at = CURRENT_TIMESTAMP WHERE job_id = ? AND finished_at IS NULL',
+            (job_id,)
+        )
+
+def _stale_filter():
+    """SQL condition (on scores s) and parameters matching scores with an outdated version tag"""
+    versions = current_versions()
+    condition = ' OR '.join(f's.{column} IS NOT ?' for column in VERSION_COLUMNS.values())
+    return f'({condition})', [versions[criterion] for criterion in VERSION_COLUMNS]
+
+def count_stale_scores():
+    """Number of transcripts whose latest score has an outdated criterion"""
+    stale_condition, stale_params = _stale_filter()
+    with connect() as conn:
+        return conn.execute(f'''
+            SELECT COUNT(*)
+            FROM transcripts t
+            JOIN scores s ON s.id = (
+                SELECT MAX(id) FROM scores WHERE transcript_id = t.id
+            )
+            WHERE {stale_condition}
+        ''', stale_params).fetchone()[0]
+
+def get_stale_score_batch(after_transcript_id, limit):
+    """
+    Up to limit transcripts after after_transcript_id (in id order) whose latest
+    score has a criterion tagged with an older scorer version than current_versions()
+    Returns dicts with score_id, transcript_id, transcript, word_count,
+    duration_seconds, 'scores' (criteria and total), 'feedback' and 'stale'
+    (the criteria to recompute)
+    """
+    versions = current_versions()
+    score_columns = ', '.join(f's.{column}' for column, _ in SCORE_COLUMNS.values())
+    version_columns = ', '.join(f's.{column}' for column in VERSION_COLUMNS.values())
+    stale_condition, stale_params = _stale_filter()
+    
+    with connect() as conn:
+        rows = conn.execute(f'''
+            SELECT s.id, t.id, t.transcript, b.content, t.word_count, t.duration_seconds,
+                   s.detailed_feedback, {score_columns}, {version_columns}
+            FROM transcripts t
+            JOIN scores s ON s.id = (
+                SELECT MAX(id) FROM scores WHERE transcript_id = t.id
+            )
+            LEFT JOIN transcript_blobs b ON b.hash = t.blob_hash
+            WHERE t.id > ? AND {stale_condition}
+            ORDER BY t.id
+            LIMIT ?
+        ''', [after_transcript_id] + stale_params + [limit]).fetchall()
+    
+    batch = []
+    for row in rows:
+        score_values = row[7:7 + len(SCORE_COLUMNS)]
+        tags = dict(zip(VERSION_COLUMNS, row[7 + len(SCORE_COLUMNS):]))
+        batch.append({
+            'score_id': row[0],
+            'transcript_id': row[1],
+            'transcript': _decode_transcript(row[2], row[3]),
+            'word_count': row[4],
+            'duration_seconds': row[5],
+            'feedback': decode_feedback(row[6]),
+            'scores': dict(zip(SCORE_COLUMNS, score_values)),
+            'stale': [criterion for criterion, tag in tags.items() if tag != versions[criterion]]
+        })
+    return batch
+
+def update_score_criteria(updates):
+    """
+    Overwrite recomputed criteria of existing scores in one transaction
+    updates: dicts with score_id, transcript_id, 'scores' (the recomputed
+    criteria plus the new 'total'), the full 'feedback', 'metrics' (the
+    score_metrics columns that changed) and 'versions' (criterion -> tag)
+    Only those columns, total_score and the feedback are rewritten. The
+    materialized score statistics are left for rebuild_aggregates(), since
+    minimum and maximum cannot be updated in place.
+    """
+    with transaction() as cursor:
+        for update in updates:
+            assignments = [f"{SCORE_COLUMNS[metric][0]} = ?" for metric in update['scores']]
+            assignments += [f"{VERSION_COLUMNS[criterion]} = ?" for criterion in update['versions']]
+            cursor.execute(
+                f"UPDATE scores SET {', '.join(assignments)}, detailed_feedback = ? WHERE id = ?",
+                list(update['scores'].values()) + list(update['versions'].values())
+                + [encode_feedback(update['feedback']), update['score_id']]
+            )
+            
+            metrics = update['metrics']
+            if metrics:
+                cursor.execute(f'''
+                    INSERT INTO score_metrics (score_id, {', '.join(metrics)})
+                    VALUES (?{', ?' * len(metrics)})
+                    ON CONFLICT(score_id) DO UPDATE SET
+                        {', '.join(f'{name} = excluded.{name}' for name in metrics)}
+                ''', [update['score_id']] + list(metrics.values()))
+        
+        _refresh_student_summaries(cursor, _rescored_students(cursor, [update['transcript_id'] for update in updates]))
+        _bump_data_version(cursor)
@@ -1,28 +1,115 @@
+import os
 import re
-from nltk.sentiment import SentimentIntensityAnalyzer
-import nltk
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, List, Optional
 
-# Download required NLTK data
-try:
-    nltk.data.find('sentiment/vader_lexicon')
-except LookupError:
-    nltk.download('vader_lexicon')
+from stage_timing import timed
+from transcript_analysis import TranscriptInput, transcript_text
 
-def get_sentiment_score(transcript: str) -> float:
+if TYPE_CHECKING:
+    from nltk.sentiment import SentimentIntensityAnalyzer
+
+# NLTK data bundled with the project; nothing is downloaded at import or scoring time.
+# Populate it once with: python cli.py download-lexicon
+NLTK_DATA_PATH = Path(__file__).parent / os.environ.get('NLTK_DATA_PATH', 'nltk_data')
+
+# Scorer version, stored with every score; bump it whenever the bands or sentiment model change
+ENGAGEMENT_VERSION = "1"
+
+# Sentiment bands as (lowest score, points, level, sentiment level), checked in order
+ENGAGEMENT_BANDS = [
+    (0.9, 15, "Excellent", "Very Positive/Enthusiastic"),
+    (0.7, 12, "Very Good", "Positive/Confident"),
+    (0.5, 9, "Good", "Mostly Positive"),
+    (0.3, 6, "Fair", "Neutral/Mixed"),
+]
+ENGAGEMENT_FALLBACK = (3, "Poor", "Negative/Disinterested")
+
+# Sentiment assumed when the lexicon cannot be used; results built on it carry
+# metrics['fallback'] = True so they are not cached or stored as real scores
+NEUTRAL_SENTIMENT = 0.5
+
+# Seconds before a failed lexicon load is tried again, so long-running
+# processes (the app, the scoring service) pick up a lexicon installed later
+LEXICON_RETRY_SECONDS = 60
+
+_analyzer = None
+_analyzer_error = None
+_analyzer_failed_at = 0.0
+_analyzer_lock = threading.Lock()
+
+def _load_analyzer() -> "SentimentIntensityAnalyzer":
+    # nltk is only imported on first use, keeping module import and worker spawn cheap
+    import nltk
+    from nltk.sentiment import SentimentIntensityAnalyzer
+    
+    data_path = str(NLTK_DATA_PATH)
+    if data_path not in nltk.data.path:
+        nltk.data.path.insert(0, data_path)
+    return SentimentIntensityAnalyzer()
+
+def get_sentiment_analyzer() -> "SentimentIntensityAnalyzer":
+    """
+    Process-wide VADER analyzer, created on first use
+    Loading the lexicon is the expensive part, so it happens once per process.
+    A missing lexicon is reported once and raised again without retrying for
+    LEXICON_RETRY_SECONDS, after which the next call tries to load it again
+    """
+    global _analyzer, _analyzer_error, _analyzer_failed_at
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                if _analyzer_error is not None and time.monotonic() - _analyzer_failed_at < LEXICON_RETRY_SECONDS:
+                    raise _analyzer_error
+                try:
+                    _analyzer = _load_analyzer()
+                except (ImportError, LookupError) as e:
+                    if _analyzer_error is None:
+                        warnings.warn(
+                            f"VADER lexicon unavailable ({type(e).__name__}); engagement falls back to neutral. "
+                            f"Run 'python cli.py download-lexicon' to install it into {NLTK_DATA_PATH}"
+                        )
+                    _analyzer_error = e
+                    _analyzer_failed_at = time.monotonic()
+                    raise
+                _analyzer_error = None
+    return _analyzer
+
+def download_lexicon(target: Optional[Path] = None) -> Path:
+    """Download the VADER lexicon into the bundled data directory (explicit, networked)"""
+    import nltk
+    
+    target = Path(target or NLTK_DATA_PATH)
+    target.mkdir(parents=True, exist_ok=True)
+    if not nltk.download('vader_lexicon', download_dir=str(target), quiet=True):
+        raise RuntimeError(f"Could not download vader_lexicon into {target}")
+    return target
+
+def analyze_sentiment(transcript: TranscriptInput) -> Optional[float]:
     """
     Get sentiment score using VADER
-    Returns positive sentiment probability (0 to 1)
+    Returns positive sentiment probability (0 to 1), or None when the lexicon
+    is unavailable or the analysis fails
     """
     try:
-        sia = SentimentIntensityAnalyzer()
-        scores = sia.polarity_scores(transcript)
-        # Return the positive compound score
-        positive_score = max(0, scores['compound'])  # Normalize to 0-1
-        return positive_score
-    except:
-        return 0.5  # Neutral fallback
-
-def score_engagement(transcript: str) -> dict:
+        sia = get_sentiment_analyzer()
+        scores = sia.polarity_scores(transcript_text(transcript))
+    except Exception:
+        return None
+    # Return the positive compound score
+    return max(0, scores['compound'])  # Normalize to 0-1
+
+def get_sentiment_score(transcript: TranscriptInput) -> float:
+    """analyze_sentiment(), with NEUTRAL_SENTIMENT when it is unavailable"""
+    sentiment = analyze_sentiment(transcript)
+    return NEUTRAL_SENTIMENT if sentiment is None else sentiment
+
+@timed('engagement')
+def score_engagement(transcript: TranscriptInput) -> dict:
     """
     Score engagement based on sentiment analysis (0-15 points)
     >=0.9: 15 pts (Excellent)
@@ -30,31 +117,28 @@ def score_engagement(transcript: str) -> dict:
     0.5-0.69: 9 pts (Good)
     0.3-0.49: 6 pts (Fair)
     <0.3: 3 pts (Poor)
+    Without the lexicon, NEUTRAL_SENTIMENT is scored and flagged as a fallback
+    """
+    return score_engagement_from_sentiment(analyze_sentiment(transcript))
+
+def score_engagement_from_sentiment(sentiment_score: Optional[float]) -> dict:
     """
-    sentiment_score = get_sentiment_score(transcript)
+    Apply the engagement rubric bands to an already computed sentiment score
+    None (no sentiment available) scores NEUTRAL_SENTIMENT with metrics['fallback'] set
+    """
+    fallback = sentiment_score is None
+    if fallback:
+        sentiment_score = NEUTRAL_SENTIMENT
     
-    if sentiment_score >= 0.9:
-        score = 15
-        level = "Excellent"
-        sentiment_level = "Very Positive/Enthusiastic"
-    elif sentiment_score >= 0.7:
-        score = 12
-        level = "Very Good"
-        sentiment_level = "Positive/Confident"
-    elif sentiment_score >= 0.5:
-        score = 9
-        level = "Good"
-        sentiment_level = "Mostly Positive"
-    elif sentiment_score >= 0.3:
-        score = 6
-        level = "Fair"
-        sentiment_level = "Neutral/Mixed"
-    else:
-        score = 3
-        level = "Poor"
-        sentiment_level = "Negative/Disinterested"
+    score, level, sentiment_level = next(
+        ((points, level, sentiment_level) for lowest, points, level, sentiment_level in ENGAGEMENT_BANDS
+         if sentiment_score >= lowest),
+        ENGAGEMENT_FALLBACK
+    )
     
     feedback = f"Engagement: {level} - Sentiment: {sentiment_level} (Score: {sentiment_score:.3f})"
+    if fallback:
+        feedback += " - sentiment lexicon unavailable, neutral score assumed"
     
     return {
         'sentiment': score,
@@ -62,6 +146,31 @@ def score_engagement(transcript: str) -> dict:
         'feedback': feedback,
         'metrics': {
             'sentiment_score': sentiment_score,
-            'sentiment_level': sentiment_level
+            'sentiment_level': sentiment_level,
+            'fallback': fallback
         }
     }
+
+def _init_sentiment_worker():
+    """Load the lexicon once when a pool worker starts"""
+    try:
+        get_sentiment_analyzer()
+    except Exception:
+        pass  # analyze_sentiment reports the fallback per call
+
+def score_engagement_many(transcripts: Iterable[TranscriptInput], workers: Optional[int] = None,
+                          chunksize: int = 32) -> List[dict]:
+    """
+    Score engagement for many transcripts, in input order
+    workers > 1 spreads polarity scoring over a process pool; each worker
+    loads the lexicon once. Otherwise the shared in-process analyzer is used.
+    """
+    texts = [transcript_text(transcript) for transcript in transcripts]
+    
+    if workers and workers > 1 and len(texts) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_sentiment_worker) as executor:
+            sentiment_scores = list(executor.map(analyze_sentiment, texts, chunksize=chunksize))
+    else:
+        sentiment_scores = [analyze_sentiment(text) for text in texts]
+    
+    return [score_engagement_from_sentiment(score) for score in sentiment_scores]
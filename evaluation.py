@@ -0,0 +1,178 @@
+"""
+Evaluation pipeline
+Runs every scorer on one transcript and combines the results the same way
+for the Streamlit app, batch scoring and other callers
+"""
+from content_scoring import FLOW_VERSION, KEYWORDS_VERSION, SALUTATION_VERSION, score_content_structure
+from speech_rate_scoring import SPEECH_RATE_VERSION, score_speech_rate
+from language_grammar_scoring import GRAMMAR_VERSION, VOCABULARY_VERSION, score_language_grammar
+from clarity_scoring import CLARITY_VERSION, score_clarity
+from engagement_scoring import ENGAGEMENT_VERSION, score_engagement
+from stage_timing import stage
+from transcript_analysis import analyze_transcript
+
+# Bump whenever scoring behaviour changes so cached results are not reused
+SCORER_VERSION = "1.0"
+
+# Rubric criteria in display order, with their maximum points
+CRITERIA = [
+    'salutation', 'keyword_presence', 'flow', 'speech_rate',
+    'grammar', 'vocabulary', 'filler_words', 'sentiment'
+]
+CRITERIA_MAX = {
+    'salutation': 5,
+    'keyword_presence': 30,
+    'flow': 5,
+    'speech_rate': 10,
+    'grammar': 10,
+    'vocabulary': 10,
+    'filler_words': 15,
+    'sentiment': 15
+}
+
+# Version of the scorer behind each criterion, stored with every score so
+# stale criteria can be recomputed on their own (see rescoring.recompute_stale)
+CRITERION_VERSIONS = {
+    'salutation': SALUTATION_VERSION,
+    'keyword_presence': KEYWORDS_VERSION,
+    'flow': FLOW_VERSION,
+    'speech_rate': SPEECH_RATE_VERSION,
+    'grammar': GRAMMAR_VERSION,
+    'vocabulary': VOCABULARY_VERSION,
+    'filler_words': CLARITY_VERSION,
+    'sentiment': ENGAGEMENT_VERSION
+}
+
+# Changes whenever any scorer does; keys cached results and rescoring jobs
+RUBRIC_VERSION = SCORER_VERSION + '/' + '.'.join(CRITERION_VERSIONS[criterion] for criterion in CRITERIA)
+
+# Rubric sections: the criteria summed into each one and its weight in the
+# 100-point total (each section's maximum equals its weight)
+SECTIONS = {
+    'content': (['salutation', 'keyword_presence', 'flow'], 40),
+    'speech_rate': (['speech_rate'], 10),
+    'language': (['grammar', 'vocabulary'], 20),
+    'clarity': (['filler_words'], 15),
+    'engagement': (['sentiment'], 15)
+}
+
+def _analyze(transcript: str):
+    with stage('analysis'):
+        return analyze_transcript(transcript)
+
+# Scoring as a dependency graph: step -> (function, names of its inputs).
+# Inputs are either evaluation arguments or earlier steps; the transcript is
+# tokenized once by 'analysis' and shared by every text scorer.
+SCORING_GRAPH = {
+    'analysis': (_analyze, ['transcript']),
+    'content': (score_content_structure, ['analysis']),
+    'speech_rate': (score_speech_rate, ['word_count', 'duration_seconds']),
+    'language': (score_language_grammar, ['analysis']),
+    'clarity': (score_clarity, ['analysis']),
+    'engagement': (score_engagement, ['transcript'])
+}
+
+def run_graph(graph: dict, inputs: dict) -> dict:
+    """
+    Run every step of a dependency graph and return {step: result}
+    Steps run in the calling thread as soon as their inputs are available.
+    The scorers take about as long as handing their inputs to a pool would,
+    so running them concurrently does not lower single-evaluation latency;
+    throughput comes from scoring many transcripts in parallel instead
+    (batch_scoring, scoring_service, rescoring)
+    """
+    values = dict(inputs)
+    pending = dict(graph)
+    
+    while pending:
+        ready = [name for name, (_, needs) in pending.items() if all(n in values for n in needs)]
+        if not ready:
+            raise ValueError(f"Unresolvable scoring steps: {', '.join(pending)}")
+        for name in ready:
+            func, needs = pending.pop(name)
+            values[name] = func(*(values[n] for n in needs))
+    
+    return {name: values[name] for name in graph}
+
+def evaluate_transcript(transcript: str, word_count: int, duration_seconds: int) -> dict:
+    """
+    Score a sanitized transcript against the full rubric
+    Returns the per-section results plus the combined 'scores', 'scaled' and 'feedback'
+    """
+    results = run_graph(SCORING_GRAPH, {
+        'transcript': transcript,
+        'word_count': word_count,
+        'duration_seconds': duration_seconds
+    })
+    
+    return combine_scores(results['content'], results['speech_rate'], results['language'],
+                          results['clarity'], results['engagement'])
+
+def combine_scores(content_scores: dict, speech_rate_scores: dict, language_scores: dict,
+                   clarity_scores: dict, engagement_scores: dict) -> dict:
+    """Combine section results into rubric scores, weighted totals and feedback"""
+    # Combine all scores
+    all_scores = {
+        'salutation': content_scores['salutation'],
+        'keyword_presence': content_scores['keyword_presence'],
+        'flow': content_scores['flow'],
+        'speech_rate': speech_rate_scores['speech_rate'],
+        'grammar': language_scores['grammar'],
+        'vocabulary': language_scores['vocabulary'],
+        'filler_words': clarity_scores['filler_words'],
+        'sentiment': engagement_scores['sentiment']
+    }
+
+    scaled = scale_sections(all_scores)
+    all_scores['total'] = sum(scaled.values())
+
+    # Prepare feedback
+    feedback = {
+        'content': content_scores['feedback'],
+        'speech_rate': speech_rate_scores['feedback'],
+        'language': language_scores['feedback'],
+        'clarity': clarity_scores['feedback'],
+        'engagement': engagement_scores['feedback']
+    }
+
+    return {
+        'scores': all_scores,
+        'scaled': scaled,
+        'feedback': feedback,
+        'content': content_scores,
+        'speech_rate': speech_rate_scores,
+        'language': language_scores,
+        'clarity': clarity_scores,
+        'engagement': engagement_scores
+    }
+
+def scale_sections(scores: dict) -> dict:
+    """Each section's criterion points scaled to its weightage; the total is their sum"""
+    return {
+        section: (sum(scores[criterion] for criterion in criteria) / weight) * weight
+        for section, (criteria, weight) in SECTIONS.items()
+    }
+
+def used_sentiment_fallback(evaluation: dict) -> bool:
+    """
+    True when engagement was scored with the neutral fallback (no lexicon);
+    such results must not be cached or written over real scores
+    """
+    return evaluation['engagement']['metrics'].get('fallback', False)
+
+def extract_metrics(evaluation: dict) -> dict:
+    """Numeric metrics behind an evaluation's scores, keyed as database.SCORE_METRIC_COLUMNS"""
+    grammar = evaluation['language']['metrics']['grammar']
+    vocabulary = evaluation['language']['metrics']['vocabulary']
+    clarity = evaluation['clarity']['metrics']
+    return {
+        'wpm': evaluation['speech_rate']['metrics']['wpm'],
+        'ttr': vocabulary['ttr'],
+        'distinct_words': vocabulary['distinct_words'],
+        'total_words': vocabulary['total_words'],
+        'filler_word_rate': clarity['filler_word_rate'],
+        'filler_count': clarity['filler_count'],
+        'grammar_errors': grammar['errors'],
+        'errors_per_100': grammar.get('errors_per_100', 0),
+        'sentiment_score': evaluation['engagement']['metrics']['sentiment_score']
+    }
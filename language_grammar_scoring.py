@@ -1,23 +1,59 @@
 import re
 from collections import Counter
 
-def calculate_ttr(transcript: str) -> float:
+from stage_timing import timed
+from transcript_analysis import TranscriptInput, ensure_analyzed
+
+# Scorer versions, stored with every score; bump one whenever its bands or detection change
+GRAMMAR_VERSION = "1"
+VOCABULARY_VERSION = "1"
+
+# Vocabulary (TTR) and grammar (raw score) bands as (lowest value, points, level), checked in order
+VOCABULARY_BANDS = [
+    (0.9, 10, "Excellent"),
+    (0.7, 8, "Very Good"),
+    (0.5, 6, "Good"),
+    (0.3, 4, "Fair"),
+]
+VOCABULARY_FALLBACK = (2, "Poor")
+
+GRAMMAR_BANDS = [
+    (0.9, 10, "Excellent"),
+    (0.7, 8, "Very Good"),
+    (0.5, 6, "Good"),
+    (0.3, 4, "Fair"),
+]
+GRAMMAR_FALLBACK = (2, "Poor")
+
+# Obvious subject-verb agreement errors, each counted at most once
+SUBJECT_VERB_PATTERNS = [
+    re.compile(r'\byou\s+is\b'),
+    re.compile(r'\bwe\s+is\b'),
+    re.compile(r'\bthey\s+is\b'),
+]
+
+MULTIPLE_SPACES_PATTERN = re.compile(r'  {2,}')
+
+# One-word sentences that are normal in speech and not counted as fragments
+FRAGMENT_EXCEPTIONS = ['yes', 'no', 'ok', 'thanks', 'great', 'nice', 'well']
+
+def calculate_ttr(transcript: TranscriptInput) -> float:
     """
     Calculate Type-Token Ratio (TTR)
     TTR = Distinct words / Total words
     """
-    words = re.findall(r'\b\w+\b', transcript.lower())
+    analysis = ensure_analyzed(transcript)
     
-    if len(words) == 0:
+    if analysis.word_count == 0:
         return 0
     
-    distinct_words = len(set(words))
-    total_words = len(words)
+    distinct_words = analysis.distinct_word_count
+    total_words = analysis.word_count
     
     ttr = distinct_words / total_words
     return ttr
 
-def score_vocabulary_richness(transcript: str) -> dict:
+def score_vocabulary_richness(transcript: TranscriptInput) -> dict:
     """
     Score vocabulary richness using TTR (0-10 points)
     0.9–1.0: 10 pts
@@ -26,23 +62,15 @@ def score_vocabulary_richness(transcript: str) -> dict:
     0.3–0.49: 4 pts
     0–0.29: 2 pts
     """
-    ttr = calculate_ttr(transcript)
-    
-    if ttr >= 0.9:
-        score = 10
-        level = "Excellent"
-    elif ttr >= 0.7:
-        score = 8
-        level = "Very Good"
-    elif ttr >= 0.5:
-        score = 6
-        level = "Good"
-    elif ttr >= 0.3:
-        score = 4
-        level = "Fair"
-    else:
-        score = 2
-        level = "Poor"
+    analysis = ensure_analyzed(transcript)
+    return score_vocabulary_from_counts(analysis.distinct_word_count, analysis.word_count)
+
+def score_vocabulary_from_counts(distinct_words: int, total_words: int) -> dict:
+    """Apply the vocabulary rubric bands to distinct and total word counts"""
+    ttr = distinct_words / total_words if total_words else 0
+    
+    score, level = next(((points, level) for lowest, points, level in VOCABULARY_BANDS if ttr >= lowest),
+                        VOCABULARY_FALLBACK)
     
     feedback = f"Vocabulary richness: {level} (TTR: {ttr:.3f})"
     
@@ -52,41 +80,38 @@ def score_vocabulary_richness(transcript: str) -> dict:
         'feedback': feedback,
         'metrics': {
             'ttr': ttr,
-            'distinct_words': len(set(re.findall(r'\b\w+\b', transcript.lower()))),
-            'total_words': len(re.findall(r'\b\w+\b', transcript.lower()))
+            'distinct_words': distinct_words,
+            'total_words': total_words
         }
     }
 
-def count_grammar_errors(transcript: str) -> int:
+def count_grammar_errors(transcript: TranscriptInput) -> int:
     """
     Simple grammar error detection using pattern matching
     Counts obvious errors to estimate quality, not to perfectly catch all errors
     Avoids overfitting to specific error patterns
     """
+    analysis = ensure_analyzed(transcript)
     errors = 0
-    text_lower = transcript.lower()
+    text_lower = analysis.text_lower
     
     # Common grammar issues - but use conservative detection
     
     # Subject-verb agreement (only obvious cases)
-    if re.search(r'\byou\s+is\b', text_lower):
-        errors += 1
-    if re.search(r'\bwe\s+is\b', text_lower):
-        errors += 1
-    if re.search(r'\bthey\s+is\b', text_lower):
-        errors += 1
+    for pattern in SUBJECT_VERB_PATTERNS:
+        if pattern.search(text_lower):
+            errors += 1
     
     # Multiple spaces (weak indicator but counts)
-    multiple_spaces = len(re.findall(r'  {2,}', transcript))
+    multiple_spaces = len(MULTIPLE_SPACES_PATTERN.findall(analysis.text))
     if multiple_spaces > 3:
         errors += 1
     
     # Very fragmented sentences (fragments < 2 words after period are usually errors)
-    sentences = re.split(r'[.!?]+', transcript)
     single_word_fragments = 0
-    for sentence in sentences:
+    for sentence in analysis.sentences:
         words = sentence.strip().split()
-        if len(words) == 1 and words[0].lower() not in ['yes', 'no', 'ok', 'thanks', 'great', 'nice', 'well']:
+        if len(words) == 1 and words[0].lower() not in FRAGMENT_EXCEPTIONS:
             single_word_fragments += 1
     
     if single_word_fragments > 2:
@@ -96,7 +121,7 @@ def count_grammar_errors(transcript: str) -> int:
     # This is intentionally conservative to avoid punishing natural speech
     return min(errors, 3)  # Max 3 errors detected to keep scoring fair
 
-def score_grammar(transcript: str) -> dict:
+def score_grammar(transcript: TranscriptInput) -> dict:
     """
     Score grammar using formula: Grammar Score = 1 - min(errors per 100 words / 10, 1)
     >0.9: 10 pts
@@ -105,8 +130,13 @@ def score_grammar(transcript: str) -> dict:
     0.3-0.49: 4 pts
     <0.3: 2 pts
     """
-    word_count = len(re.findall(r'\b\w+\b', transcript))
-    
+    analysis = ensure_analyzed(transcript)
+    word_count = analysis.word_count
+    errors = count_grammar_errors(analysis) if word_count else 0
+    return score_grammar_from_errors(errors, word_count)
+
+def score_grammar_from_errors(errors: int, word_count: int) -> dict:
+    """Apply the grammar rubric bands to an error count"""
     if word_count == 0:
         return {
             'grammar': 0,
@@ -115,27 +145,13 @@ def score_grammar(transcript: str) -> dict:
             'metrics': {'error_rate': 0, 'errors': 0}
         }
     
-    errors = count_grammar_errors(transcript)
     errors_per_100 = (errors / word_count) * 100
     
     # Formula from rubric: 1 - min(errors_per_100_words / 10, 1)
     grammar_score_raw = 1 - min(errors_per_100 / 10, 1)
     
-    if grammar_score_raw >= 0.9:
-        score = 10
-        level = "Excellent"
-    elif grammar_score_raw >= 0.7:
-        score = 8
-        level = "Very Good"
-    elif grammar_score_raw >= 0.5:
-        score = 6
-        level = "Good"
-    elif grammar_score_raw >= 0.3:
-        score = 4
-        level = "Fair"
-    else:
-        score = 2
-        level = "Poor"
+    score, level = next(((points, level) for lowest, points, level in GRAMMAR_BANDS if grammar_score_raw >= lowest),
+                        GRAMMAR_FALLBACK)
     
     feedback = f"Grammar: {level} ({errors} errors found, {errors_per_100:.2f} errors per 100 words)"
     
@@ -150,8 +166,10 @@ def score_grammar(transcript: str) -> dict:
         }
     }
 
-def score_language_grammar(transcript: str) -> dict:
+@timed('language')
+def score_language_grammar(transcript: TranscriptInput) -> dict:
     """Aggregate language and grammar scores"""
+    transcript = ensure_analyzed(transcript)
     grammar_result = score_grammar(transcript)
     vocabulary_result = score_vocabulary_richness(transcript)
     
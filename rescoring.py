@@ -0,0 +1,256 @@
+"""
+Resumable rescoring of stored transcripts
+After a rubric change, every stored transcript is scored again and a new
+scores row is written (the latest score per transcript is the one shown).
+Transcripts are read in id order in short keyset batches, scored across a
+process pool, and each batch is saved together with the job checkpoint, so an
+interrupted run resumes after the last saved batch and the app keeps reading
+throughout (WAL mode, one short write transaction per batch).
+
+When only some scorers changed (their version tags in
+evaluation.CRITERION_VERSIONS were bumped), recompute_stale() reruns just
+those criteria on each latest score and updates it in place.
+"""
+from typing import Callable, Iterator, Optional
+
+from batch_jobs import ThroughputReporter, bounded_map
+from clarity_scoring import score_clarity
+from content_scoring import check_flow, score_keyword_presence, score_salutation
+from database import (
+    count_stale_scores, count_transcripts_between, finish_rescore_job, get_stale_score_batch,
+    get_transcript_batch, rebuild_aggregates, save_rescored_batch, start_rescore_job, update_score_criteria
+)
+from engagement_scoring import get_sentiment_analyzer, score_engagement
+from evaluation import (
+    CRITERION_VERSIONS, RUBRIC_VERSION, evaluate_transcript, extract_metrics, scale_sections, used_sentiment_fallback
+)
+from language_grammar_scoring import score_grammar, score_vocabulary_richness
+from speech_rate_scoring import score_speech_rate
+from transcript_analysis import analyze_transcript
+
+def default_job_id() -> str:
+    """One job per rubric version: rerunning after an interruption resumes it"""
+    return f"rescore-{RUBRIC_VERSION}"
+
+def require_sentiment_analyzer():
+    """
+    Load the VADER lexicon in this process or raise RuntimeError, so stored
+    scores are never replaced by the neutral fallback sentiment
+    """
+    try:
+        get_sentiment_analyzer()
+    except (ImportError, LookupError) as e:
+        raise RuntimeError(
+            f"VADER lexicon unavailable ({type(e).__name__}); run 'python cli.py download-lexicon' first"
+        ) from e
+
+def rescore_batch(batch: list) -> tuple:
+    """
+    Score (transcript_id, transcript, word_count, duration_seconds) rows
+    Returns (score rows for save_scores_many, failed count); a transcript that
+    fails to score, or whose sentiment fell back to neutral, keeps its previous score
+    """
+    require_sentiment_analyzer()
+    
+    score_rows = []
+    failed = 0
+    for transcript_id, transcript, word_count, duration_seconds in batch:
+        try:
+            evaluation = evaluate_transcript(transcript, word_count, duration_seconds or 0)
+        except Exception:
+            failed += 1
+            continue
+        if used_sentiment_fallback(evaluation):
+            failed += 1
+            continue
+        score_rows.append((transcript_id, evaluation['scores'], evaluation['feedback'], extract_metrics(evaluation)))
+    return score_rows, failed
+
+def _batches(after_id: int, upto_id: int, batch_size: int) -> Iterator[list]:
+    while True:
+        batch = get_transcript_batch(after_id, upto_id, batch_size)
+        if not batch:
+            return
+        yield batch
+        after_id = batch[-1][0]
+
+def run_rescore(job_id: Optional[str] = None, workers: int = 1, batch_size: int = 200,
+                restart: bool = False, progress_interval: float = 5.0,
+                progress: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    Rescore every transcript stored when the job was first started
+    Raises RuntimeError before starting if the VADER lexicon is unavailable.
+    Returns a summary with the rows rescored and failed in this run, elapsed
+    time and rows per second
+    """
+    reporter = ThroughputReporter("transcripts rescored", progress_interval, progress)
+    job_id = job_id or default_job_id()
+    require_sentiment_analyzer()
+
+    job = start_rescore_job(job_id, restart)
+    if job['finished_at'] is not None:
+        reporter.progress(f"Job {job_id} already finished at {job['finished_at']}; use restart to run it again")
+        return {'job_id': job_id, 'rows': 0, 'rescored': 0, 'failed': 0,
+                'elapsed_seconds': 0, 'rows_per_second': 0}
+
+    target_id = job['target_transcript_id']
+    reporter.total = remaining = count_transcripts_between(job['last_transcript_id'], target_id)
+    if job['last_transcript_id']:
+        reporter.progress(f"Resuming job {job_id} after transcript {job['last_transcript_id']} ({remaining} remaining)")
+    else:
+        reporter.progress(f"Starting job {job_id}: {remaining} transcripts")
+
+    rescored = failed = 0
+    batches = _batches(job['last_transcript_id'], target_id, batch_size)
+    for batch, (score_rows, batch_failed) in bounded_map(rescore_batch, batches, workers):
+        save_rescored_batch(job_id, score_rows, batch[-1][0], batch_failed)
+        rescored += len(score_rows)
+        failed += batch_failed
+        reporter.update(rescored + failed)
+
+    finish_rescore_job(job_id)
+    # Batches keep counts and averages exact; min and max can still hold a
+    # superseded score, so the statistics are rebuilt once from the latest scores
+    rebuild_aggregates()
+
+    total = rescored + failed
+    return {
+        'job_id': job_id,
+        'rows': total,
+        'rescored': rescored,
+        'failed': failed,
+        **reporter.finish(total, f"{rescored} rescored, {failed} failed")
+    }
+
+def _speech_rate(analysis, word_count, duration_seconds):
+    result = score_speech_rate(word_count, duration_seconds)
+    return result['speech_rate'], result['feedback'], {'wpm': result['metrics']['wpm']}
+
+def _grammar(analysis, word_count, duration_seconds):
+    result = score_grammar(analysis)
+    metrics = result['metrics']
+    return result['grammar'], result['feedback'], {
+        'grammar_errors': metrics['errors'], 'errors_per_100': metrics.get('errors_per_100', 0)
+    }
+
+def _vocabulary(analysis, word_count, duration_seconds):
+    result = score_vocabulary_richness(analysis)
+    return result['vocabulary'], result['feedback'], dict(result['metrics'])
+
+def _clarity(analysis, word_count, duration_seconds):
+    result = score_clarity(analysis)
+    metrics = result['metrics']
+    return result['filler_words'], result['feedback'], {
+        'filler_word_rate': metrics['filler_word_rate'], 'filler_count': metrics['filler_count']
+    }
+
+def _engagement(analysis, word_count, duration_seconds):
+    result = score_engagement(analysis)
+    if result['metrics']['fallback']:
+        raise RuntimeError("Sentiment analysis failed")
+    return result['sentiment'], result['feedback'], {'sentiment_score': result['metrics']['sentiment_score']}
+
+# criterion -> (scorer returning (points, feedback, score_metrics columns), feedback path)
+CRITERION_SCORERS = {
+    'salutation': (lambda analysis, *_: (*score_salutation(analysis), {}), ('content', 'salutation')),
+    'keyword_presence': (lambda analysis, *_: (*score_keyword_presence(analysis), {}), ('content', 'keywords')),
+    'flow': (lambda analysis, *_: (*check_flow(analysis), {}), ('content', 'flow')),
+    'speech_rate': (_speech_rate, ('speech_rate',)),
+    'grammar': (_grammar, ('language', 'grammar')),
+    'vocabulary': (_vocabulary, ('language', 'vocabulary')),
+    'filler_words': (_clarity, ('clarity',)),
+    'sentiment': (_engagement, ('engagement',)),
+}
+
+def recompute_batch(batch: list) -> tuple:
+    """
+    Rerun the stale criteria of get_stale_score_batch() rows
+    Returns (updates for update_score_criteria, failed count)
+    """
+    if any('sentiment' in row['stale'] for row in batch):
+        require_sentiment_analyzer()
+    
+    updates = []
+    failed = 0
+    for row in batch:
+        try:
+            analysis = analyze_transcript(row['transcript'])
+            scores = dict(row['scores'])
+            feedback = row['feedback'] or {}
+            changed = {}
+            metrics = {}
+            for criterion in row['stale']:
+                scorer, path = CRITERION_SCORERS[criterion]
+                points, criterion_feedback, criterion_metrics = scorer(
+                    analysis, row['word_count'], row['duration_seconds'] or 0
+                )
+                scores[criterion] = changed[criterion] = points
+                metrics.update(criterion_metrics)
+                section = feedback
+                for key in path[:-1]:
+                    section = section.setdefault(key, {})
+                section[path[-1]] = criterion_feedback
+        except Exception:
+            failed += 1
+            continue
+
+        changed['total'] = sum(scale_sections(scores).values())
+        updates.append({
+            'score_id': row['score_id'],
+            'transcript_id': row['transcript_id'],
+            'scores': changed,
+            'feedback': feedback,
+            'metrics': metrics,
+            'versions': {criterion: CRITERION_VERSIONS[criterion] for criterion in row['stale']}
+        })
+    return updates, failed
+
+def _stale_batches(batch_size: int) -> Iterator[list]:
+    after_id = 0
+    while True:
+        batch = get_stale_score_batch(after_id, batch_size)
+        if not batch:
+            return
+        yield batch
+        after_id = batch[-1]['transcript_id']
+
+def recompute_stale(workers: int = 1, batch_size: int = 200, progress_interval: float = 5.0,
+                    progress: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    Rerun only the outdated criteria of every transcript's latest score
+    A score is stale where its stored version tag for a criterion differs from
+    evaluation.CRITERION_VERSIONS (scores saved before versioning have no tags
+    and are recomputed in full). Updated rows are no longer stale, so an
+    interrupted run simply continues when started again. A batch with stale
+    sentiment raises RuntimeError if the VADER lexicon is unavailable.
+    Returns a summary with rows updated and failed, per-criterion counts,
+    elapsed time and rows per second
+    """
+    reporter = ThroughputReporter("scores recomputed", progress_interval, progress)
+    reporter.total = remaining = count_stale_scores()
+    reporter.progress(f"{remaining} scores have outdated criteria")
+
+    updated = failed = 0
+    criteria_counts = {}
+    for _, (updates, batch_failed) in bounded_map(recompute_batch, _stale_batches(batch_size), workers):
+        update_score_criteria(updates)
+        updated += len(updates)
+        failed += batch_failed
+        for update in updates:
+            for criterion in update['versions']:
+                criteria_counts[criterion] = criteria_counts.get(criterion, 0) + 1
+        reporter.update(updated + failed)
+
+    if updated:
+        # Scores changed in place, so the materialized statistics are recomputed once
+        rebuild_aggregates()
+
+    total = updated + failed
+    recomputed = ', '.join(f"{criterion} {count}" for criterion, count in criteria_counts.items()) or 'none'
+    return {
+        'rows': total,
+        'updated': updated,
+        'failed': failed,
+        'criteria': criteria_counts,
+        **reporter.finish(total, f"{updated} updated ({recomputed}), {failed} failed")
+    }
@@ -0,0 +1,106 @@
+"""
+Streaming export of stored evaluations
+Reads scores from SQLite in fetchmany batches and writes each batch straight
+to CSV, JSONL or Parquet, so memory stays flat for any number of rows
+"""
+import csv
+import json
+from pathlib import Path
+from typing import Callable, Optional
+
+from batch_jobs import ThroughputReporter
+from database import EXPORT_FIELDS, SCORE_COLUMNS, SCORE_METRIC_COLUMNS, iter_score_batches
+
+# Output columns in order; feedback is a JSON string in CSV and Parquet
+EXPORT_COLUMNS = EXPORT_FIELDS + list(SCORE_COLUMNS) + list(SCORE_METRIC_COLUMNS) + ['feedback']
+
+EXPORT_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.parquet': 'parquet'}
+
+def detect_export_format(path: str) -> str:
+    """Map an output extension to 'csv', 'jsonl' or 'parquet' (JSONL if unknown)"""
+    return EXPORT_FORMATS.get(Path(path).suffix.lower(), 'jsonl')
+
+class CsvExportWriter:
+    """Write one flat CSV row per score"""
+
+    def __init__(self, path: str):
+        self.f = open(path, 'w', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.f, fieldnames=EXPORT_COLUMNS)
+        self.writer.writeheader()
+
+    def write_batch(self, rows: list):
+        self.writer.writerows({**row, 'feedback': json.dumps(row['feedback'])} for row in rows)
+
+    def close(self):
+        self.f.close()
+
+class JsonlExportWriter:
+    """Write one JSON object per score, feedback nested"""
+
+    def __init__(self, path: str):
+        self.f = open(path, 'w', encoding='utf-8')
+
+    def write_batch(self, rows: list):
+        self.f.writelines(json.dumps({column: row[column] for column in EXPORT_COLUMNS}) + '\n' for row in rows)
+
+    def close(self):
+        self.f.close()
+
+class ParquetExportWriter:
+    """Write each batch as a Parquet row group (requires pyarrow)"""
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)") from e
+
+        self.pa = pa
+        integer_columns = {'score_id', 'transcript_id', 'word_count', 'sentence_count', 'duration_seconds'}
+        integer_columns.update(name for name, column_type in SCORE_METRIC_COLUMNS.items() if column_type == 'INTEGER')
+        text_columns = {'student_name', 'created_at', 'scored_at', 'feedback'}
+        self.schema = pa.schema([
+            (column, pa.string() if column in text_columns
+             else pa.int64() if column in integer_columns else pa.float64())
+            for column in EXPORT_COLUMNS
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write_batch(self, rows: list):
+        columns = {column: [row[column] for row in rows] for column in EXPORT_COLUMNS}
+        columns['feedback'] = [json.dumps(feedback) for feedback in columns['feedback']]
+        self.writer.write_table(self.pa.Table.from_pydict(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+EXPORT_WRITERS = {
+    'csv': CsvExportWriter,
+    'jsonl': JsonlExportWriter,
+    'parquet': ParquetExportWriter
+}
+
+def export_results(output_path: str, output_format: Optional[str] = None, batch_size: int = 5000,
+                   student_name: Optional[str] = None, date_from=None, date_to=None,
+                   progress_interval: float = 5.0,
+                   progress: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    Stream every stored score (optionally for one student or a date range)
+    to output_path, batch_size rows at a time
+    Returns a summary with the row count, elapsed time and rows per second
+    """
+    output_format = output_format or detect_export_format(output_path)
+
+    rows = 0
+    reporter = ThroughputReporter("rows exported", progress_interval, progress)
+    writer = EXPORT_WRITERS[output_format](output_path)
+    try:
+        for batch in iter_score_batches(batch_size, student_name, date_from, date_to):
+            writer.write_batch(batch)
+            rows += len(batch)
+            reporter.update(rows)
+    finally:
+        writer.close()
+
+    return {'rows': rows, **reporter.finish(rows, f"{rows} rows exported to {output_path}")}
@@ -0,0 +1,129 @@
+"""
+Content-addressed score cache
+Identical submissions (same sanitized text, word count, duration and scorer
+version) reuse a stored evaluation instead of running the scorers again
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from evaluation import RUBRIC_VERSION, evaluate_transcript, used_sentiment_fallback
+from validation import sanitize_transcript
+
+DEFAULT_MEMORY_ENTRIES = 1024
+
+def make_cache_key(transcript: str, word_count: int, duration_seconds: int,
+                   scorer_version: str = RUBRIC_VERSION) -> str:
+    """SHA-256 over the sanitized transcript and every other scoring input"""
+    digest = hashlib.sha256()
+    digest.update(sanitize_transcript(transcript).encode('utf-8'))
+    digest.update(f"\0{word_count}\0{duration_seconds}\0{scorer_version}".encode('utf-8'))
+    return digest.hexdigest()
+
+def _cacheable(evaluation: dict) -> bool:
+    """
+    Only evaluations with a real sentiment score are cached; entries written
+    before the fallback was flagged cannot be told apart, so they are not used
+    """
+    return 'fallback' in evaluation['engagement']['metrics'] and not used_sentiment_fallback(evaluation)
+
+class ScoreCache:
+    """
+    Two-tier cache of evaluate_transcript() results
+    An in-memory LRU tier sits in front of the score_cache table; entries are
+    kept as JSON so callers always get a fresh copy they can modify
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MEMORY_ENTRIES, persistent: bool = True):
+        self.max_entries = max_entries
+        self.persistent = persistent
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def get(self, cache_key: str) -> Optional[dict]:
+        """Look up a key in memory, then in the database"""
+        with self._lock:
+            result_json = self._entries.get(cache_key)
+            if result_json is not None:
+                self._entries.move_to_end(cache_key)
+                self.memory_hits += 1
+                return json.loads(result_json)
+
+        if self.persistent:
+            from database import get_cached_result
+            result_json = get_cached_result(cache_key)
+            if result_json is not None:
+                evaluation = json.loads(result_json)
+                if _cacheable(evaluation):
+                    self._remember(cache_key, result_json)
+                    with self._lock:
+                        self.persistent_hits += 1
+                    return evaluation
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, cache_key: str, evaluation: dict):
+        """Store an evaluation in both tiers, unless its engagement fell back to neutral"""
+        if not _cacheable(evaluation):
+            return
+        result_json = json.dumps(evaluation)
+        self._remember(cache_key, result_json)
+        if self.persistent:
+            from database import save_cached_result
+            save_cached_result(cache_key, result_json)
+
+    def _remember(self, cache_key: str, result_json: str):
+        with self._lock:
+            self._entries[cache_key] = result_json
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def evaluate(self, transcript: str, word_count: int, duration_seconds: int) -> dict:
+        """evaluate_transcript() with caching; the transcript is sanitized first"""
+        transcript = sanitize_transcript(transcript)
+        cache_key = make_cache_key(transcript, word_count, duration_seconds)
+
+        evaluation = self.get(cache_key)
+        if evaluation is None:
+            evaluation = evaluate_transcript(transcript, word_count, duration_seconds)
+            self.put(cache_key, evaluation)
+        return evaluation
+
+    def clear(self):
+        """Drop the memory tier and reset counters (the persistent tier is left alone)"""
+        with self._lock:
+            self._entries.clear()
+            self.memory_hits = self.persistent_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current memory tier size"""
+        with self._lock:
+            hits = self.memory_hits + self.persistent_hits
+            lookups = hits + self.misses
+            return {
+                'memory_hits': self.memory_hits,
+                'persistent_hits': self.persistent_hits,
+                'misses': self.misses,
+                'hit_rate': hits / lookups if lookups else 0,
+                'memory_entries': len(self._entries)
+            }
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_score_cache() -> ScoreCache:
+    """Process-wide cache shared by the app and batch scoring"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = ScoreCache()
+    return _default_cache
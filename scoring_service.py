@@ -0,0 +1,385 @@
+"""
+Local HTTP scoring service
+A small asyncio HTTP/1.1 server wrapping the same pipeline as the Streamlit
+app. CPU-bound scoring runs in a process pool so the event loop stays free.
+
+Endpoints:
+    POST /score         one submission -> scores, scaled sections and feedback
+    POST /score/batch   {"items": [...]} -> one result (or error) per item
+    GET  /health        liveness, pool size and pool restarts (503 if the pool was broken)
+    GET  /metrics       request counts, errors and latency percentiles
+    GET  /metrics/prometheus  stage timing histograms (with --timing)
+
+Usage: python scoring_service.py --port 8765 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from typing import Optional
+
+from batch_scoring import score_row
+from stage_timing import STAGE_TIMINGS, collect, enable_timing
+from validation import MAX_TRANSCRIPT_LENGTH
+
+MAX_BATCH_ITEMS = 100
+
+# Request bodies are capped from the transcript limit: worst-case UTF-8 is
+# 4 bytes per character, plus room for the other fields and JSON escaping
+MAX_ITEM_BYTES = MAX_TRANSCRIPT_LENGTH * 4 + 4096
+MAX_BODY_BYTES = {
+    '/score': MAX_ITEM_BYTES,
+    '/score/batch': MAX_ITEM_BYTES * MAX_BATCH_ITEMS,
+}
+MAX_HEADER_BYTES = 16 * 1024
+
+ROUTE_PATHS = {'/score', '/score/batch', '/health', '/metrics', '/metrics/prometheus'}
+
+KEEP_ALIVE_TIMEOUT = 15
+LATENCY_WINDOW = 1000
+
+class RouteMetrics:
+    """Request counters plus a sliding window of recent latencies for one route"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, status: int, seconds: float):
+        self.requests += 1
+        if status >= 400:
+            self.errors += 1
+        self.latencies.append(seconds)
+
+    def snapshot(self) -> dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'latency_ms': {'p50': percentile(0.50), 'p90': percentile(0.90), 'p99': percentile(0.99)},
+        }
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def _init_worker():
+    """
+    Pool initializer: drop the signal handling forked from the service's event loop
+    Otherwise the SIGTERM the pool sends its other workers when one crashes is
+    written to the inherited wakeup fd and shuts the whole service down
+    """
+    signal.set_wakeup_fd(-1)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    # Ctrl+C reaches the whole process group; the service shuts workers down itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def _ping() -> bool:
+    """Pool task used by /health to check that a worker answers"""
+    return True
+
+def _score_items(items: list) -> tuple:
+    """
+    Pool task: score a list of submissions (runs in a worker process)
+    Returns the results and the stage timings recorded while scoring them
+    """
+    with collect() as timings:
+        results = [score_row(number, item) for number, item in enumerate(items, 1)]
+    return results, timings
+
+def _public_result(result: dict) -> dict:
+    if result['error'] is not None:
+        return {'error': result['error']}
+    return {'scores': result['scores'], 'feedback': result['feedback']}
+
+class ScoringService:
+    """HTTP front end over a process pool of scorers"""
+
+    def __init__(self, workers: Optional[int] = None, save_to_db: bool = False):
+        self.workers = workers or os.cpu_count() or 1
+        self.save_to_db = save_to_db
+        self.executor = None
+        self.server = None
+        self.started = time.monotonic()
+        self.in_flight = 0
+        self.pool_restarts = 0
+        self.metrics = {}
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765):
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        if self.save_to_db:
+            from database import ensure_db
+            ensure_db()
+        self.server = await asyncio.start_server(self._handle_connection, host, port, limit=MAX_HEADER_BYTES)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+    def _restart_pool(self, broken: ProcessPoolExecutor):
+        """Replace a broken pool (once, however many requests saw it break)"""
+        if self.executor is broken:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            self.pool_restarts += 1
+
+    async def _submit(self, func, *args):
+        """
+        Run func(*args) in the pool
+        A pool that broke while idle refuses the submit; it is replaced and the
+        call submitted once more. A worker dying during the call raises
+        BrokenProcessPool after the pool has been replaced
+        """
+        executor = self.executor
+        try:
+            future = executor.submit(func, *args)
+        except BrokenProcessPool:
+            self._restart_pool(executor)
+            executor = self.executor
+            future = executor.submit(func, *args)
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._restart_pool(executor)
+            raise
+
+    # HTTP plumbing
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                                        {'error': "Request headers too large"}, keep_alive=False)
+                    return
+
+                started = time.perf_counter()
+                method, path, headers = self._parse_head(head)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+
+                body = None
+                try:
+                    body = await self._read_body(reader, method, path, headers)
+                    status, payload = await self._dispatch(method, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {'error': e.message}
+                except Exception as e:
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"Scoring failed: {e}"}
+
+                # A rejected body is still unread on the socket, so the connection cannot be reused
+                if body is None and method == 'POST':
+                    keep_alive = False
+
+                await self._respond(writer, status, payload, keep_alive)
+                route = path if path in ROUTE_PATHS else 'unmatched'
+                self.metrics.setdefault(route, RouteMetrics()).record(status, time.perf_counter() - started)
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse_head(head: bytes):
+        lines = head.decode('latin-1').split('\r\n')
+        parts = lines[0].split(' ')
+        method, path = (parts[0], parts[1].split('?', 1)[0]) if len(parts) == 3 else ('', '')
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        return method, path, headers
+
+    async def _read_body(self, reader, method, path, headers) -> bytes:
+        if method != 'POST':
+            return b''
+        if 'content-length' not in headers:
+            raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "Content-Length header required")
+        try:
+            length = int(headers['content-length'])
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES.get(path, MAX_ITEM_BYTES):
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        return await reader.readexactly(length)
+
+    @staticmethod
+    async def _respond(writer, status: HTTPStatus, payload, keep_alive: bool):
+        # Text payloads (the Prometheus exposition) are sent as-is, everything else as JSON
+        if isinstance(payload, str):
+            body, content_type = payload.encode('utf-8'), 'text/plain; version=0.0.4'
+        else:
+            body, content_type = json.dumps(payload).encode('utf-8'), 'application/json'
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    # Routes
+
+    async def _dispatch(self, method: str, path: str, body: bytes):
+        routes = {
+            ('POST', '/score'): self._score,
+            ('POST', '/score/batch'): self._score_batch,
+            ('GET', '/health'): self._health,
+            ('GET', '/metrics'): self._metrics,
+            ('GET', '/metrics/prometheus'): self._prometheus,
+        }
+        handler = routes.get((method, path))
+        if handler is None:
+            if path in ROUTE_PATHS:
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}")
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+        return await handler(self._parse_json(body) if method == 'POST' else None)
+
+    @staticmethod
+    def _parse_json(body: bytes):
+        try:
+            return json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be valid JSON")
+
+    async def _run_scoring(self, items: list) -> list:
+        self.in_flight += 1
+        try:
+            results, timings = await self._submit(_score_items, items)
+        except BrokenProcessPool:
+            # A worker died while this request was in flight; later requests get a fresh pool
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Scoring worker crashed; retry the request")
+        finally:
+            self.in_flight -= 1
+        # Worker processes time their stages; the histograms live here
+        for stage, seconds in timings:
+            STAGE_TIMINGS.observe(stage, seconds)
+        return results
+
+    async def _save(self, items: list, results: list):
+        from batch_scoring import evaluation_record
+        from database import save_evaluations_many
+
+        records = [evaluation_record(item, result) for item, result in zip(items, results)
+                   if result['error'] is None]
+        if records:
+            await asyncio.get_running_loop().run_in_executor(None, save_evaluations_many, records)
+
+    async def _score(self, payload):
+        if not isinstance(payload, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+        result = (await self._run_scoring([payload]))[0]
+        if result['error'] is not None:
+            raise HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, result['error'])
+        if self.save_to_db:
+            await self._save([payload], [result])
+        return HTTPStatus.OK, _public_result(result)
+
+    async def _score_batch(self, payload):
+        items = payload.get('items') if isinstance(payload, dict) else None
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body must be {\"items\": [submission, ...]}")
+        if len(items) > MAX_BATCH_ITEMS:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"At most {MAX_BATCH_ITEMS} items per batch")
+
+        # Spread the batch over the pool instead of handing it all to one worker
+        chunk_size = max(1, -(-len(items) // self.workers))
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        results = [result for chunk in await asyncio.gather(*(self._run_scoring(c) for c in chunks))
+                   for result in chunk]
+        if self.save_to_db:
+            await self._save(items, results)
+        return HTTPStatus.OK, {'results': [_public_result(result) for result in results]}
+
+    async def _health(self, _):
+        health = {
+            'status': 'ok',
+            'workers': self.workers,
+            'in_flight': self.in_flight,
+            'pool_restarts': self.pool_restarts,
+            'uptime_seconds': time.monotonic() - self.started,
+        }
+        # An idle pool is probed with a no-op task; while requests are in flight
+        # their own submits find a broken pool, so health never queues behind them
+        restarts = self.pool_restarts
+        if self.in_flight == 0:
+            try:
+                await self._submit(_ping)
+            except BrokenProcessPool:
+                pass
+        if self.pool_restarts > restarts:
+            # Reported once, then recovered, so an idle service does not stay unhealthy
+            health.update(status='pool_broken', pool_restarts=self.pool_restarts)
+            return HTTPStatus.SERVICE_UNAVAILABLE, health
+        return HTTPStatus.OK, health
+
+    async def _metrics(self, _):
+        return HTTPStatus.OK, {
+            'in_flight': self.in_flight,
+            'routes': {path: metrics.snapshot() for path, metrics in self.metrics.items()},
+        }
+
+    async def _prometheus(self, _):
+        return HTTPStatus.OK, STAGE_TIMINGS.render_prometheus()
+
+async def serve(host: str, port: int, workers: Optional[int], save_to_db: bool):
+    service = ScoringService(workers=workers, save_to_db=save_to_db)
+    server = await service.start(host, port)
+    print(f"Scoring service listening on http://{host}:{port} with {service.workers} workers")
+
+    # Shut down through close() on SIGTERM as well as Ctrl+C, so pool workers
+    # (which inherit the listening socket) never outlive the service
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+    try:
+        await stopping.wait()
+    finally:
+        await service.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local HTTP scoring service")
+    parser.add_argument('--host', default='127.0.0.1', help="Interface to bind (default: localhost only)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, help="Scoring processes (default: CPU count)")
+    parser.add_argument('--save-to-db', action='store_true', help="Store scored submissions in the database")
+    parser.add_argument('--timing', action='store_true', help="Record per-stage timings for /metrics/prometheus")
+    args = parser.parse_args(argv)
+
+    if args.timing:
+        # Set in the environment too, so pool workers started later inherit it
+        os.environ['SPEECH_SCORE_TIMING'] = '1'
+        enable_timing()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.save_to_db))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,27 @@
+from stage_timing import timed
+
+# Scorer version, stored with every score; bump it whenever the bands change
+SPEECH_RATE_VERSION = "1"
+
+# WPM bands as (lower, lower_inclusive, upper, points, feedback), checked in
+# order; upper bounds are inclusive and None is unbounded. Rates in none of
+# the bands, including the gaps between them, get the fallback
+SPEECH_RATE_BANDS = [
+    (161, False, None, 2, "Too fast: {wpm:.1f} WPM (ideal: 111-140)"),
+    (141, True, 160, 6, "Fast: {wpm:.1f} WPM (ideal: 111-140)"),
+    (111, True, 140, 10, "Ideal: {wpm:.1f} WPM"),
+    (81, True, 110, 6, "Slow: {wpm:.1f} WPM (ideal: 111-140)"),
+]
+SPEECH_RATE_FALLBACK = (2, "Too slow: {wpm:.1f} WPM (ideal: 111-140)")
+
+def speech_rate_band(wpm: float) -> tuple:
+    """(points, feedback template) for a WPM value"""
+    for lower, lower_inclusive, upper, points, feedback in SPEECH_RATE_BANDS:
+        above_lower = wpm >= lower if lower_inclusive else wpm > lower
+        if above_lower and (upper is None or wpm <= upper):
+            return points, feedback
+    return SPEECH_RATE_FALLBACK
+
 def calculate_speech_rate(word_count: int, duration_seconds: int) -> tuple:
     """
     Calculate speech rate in WPM (words per minute)
@@ -12,17 +36,10 @@ def calculate_speech_rate(word_count: int, duration_seconds: int) -> tuple:
     
     wpm = (word_count / duration_seconds) * 60
     
-    if wpm > 161:
-        return 2, f"Too fast: {wpm:.1f} WPM (ideal: 111-140)"
-    elif 141 <= wpm <= 160:
-        return 6, f"Fast: {wpm:.1f} WPM (ideal: 111-140)"
-    elif 111 <= wpm <= 140:
-        return 10, f"Ideal: {wpm:.1f} WPM"
-    elif 81 <= wpm <= 110:
-        return 6, f"Slow: {wpm:.1f} WPM (ideal: 111-140)"
-    else:  # < 80
-        return 2, f"Too slow: {wpm:.1f} WPM (ideal: 111-140)"
+    points, feedback = speech_rate_band(wpm)
+    return points, feedback.format(wpm=wpm)
 
+@timed('speech_rate')
 def score_speech_rate(word_count: int, duration_seconds: int) -> dict:
     """Aggregate speech rate scoring"""
     score, feedback = calculate_speech_rate(word_count, duration_seconds)
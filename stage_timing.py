@@ -0,0 +1,169 @@
+"""
+Per-stage timing instrumentation
+Each evaluation stage (sanitize, analysis, the five scoring sections, database
+write, chart build) is timed into in-process histograms that can be exported
+in the Prometheus text format.
+
+Disabled by default; set SPEECH_SCORE_TIMING=1 to enable, and
+SPEECH_SCORE_TIMING_PERSIST=1 to also store each evaluation's timings in the
+evaluation_metrics table. While disabled, stage() hands back one shared no-op
+context manager and timed() functions call straight through.
+"""
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Tuple
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+TIMING_ENABLED = _env_flag('SPEECH_SCORE_TIMING')
+TIMING_PERSIST = _env_flag('SPEECH_SCORE_TIMING_PERSIST')
+
+# Histogram bucket upper bounds in seconds; the Prometheus defaults extended
+# below 5ms, where most scoring stages finish
+TIMING_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Prefix of evaluation_metrics rows holding stage timings
+STAGE_METRIC_PREFIX = 'stage_seconds.'
+
+_NO_TIMER = nullcontext()
+_collectors = threading.local()
+
+class StageHistogram:
+    """Bucketed distribution of one stage's durations"""
+
+    def __init__(self, buckets=TIMING_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.sum += seconds
+        for index, upper in enumerate(self.buckets):
+            if seconds <= upper:
+                self.bucket_counts[index] += 1
+                break
+
+    def snapshot(self) -> dict:
+        cumulative = []
+        running = 0
+        for upper, count in zip(self.buckets, self.bucket_counts):
+            running += count
+            cumulative.append((upper, running))
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else 0,
+            'buckets': cumulative,
+        }
+
+class StageTimings:
+    """Thread-safe set of per-stage histograms"""
+
+    def __init__(self, buckets=TIMING_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = StageHistogram(self.buckets)
+            histogram.observe(seconds)
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            return {stage: histogram.snapshot() for stage, histogram in sorted(self._histograms.items())}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render_prometheus(self, name: str = 'speech_score_stage_seconds') -> str:
+        """Histograms in the Prometheus text exposition format"""
+        lines = [
+            f"# HELP {name} Time spent in each evaluation stage",
+            f"# TYPE {name} histogram",
+        ]
+        for stage, histogram in self.snapshot().items():
+            for upper, count in histogram['buckets']:
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{upper}"}} {count}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {histogram["count"]}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram["sum"]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram["count"]}')
+        return '\n'.join(lines) + '\n'
+
+# Process-wide histograms fed by stage() and timed()
+STAGE_TIMINGS = StageTimings()
+
+def enable_timing(enabled: bool = True):
+    """Turn instrumentation on or off for this process"""
+    global TIMING_ENABLED
+    TIMING_ENABLED = enabled
+
+def timing_enabled() -> bool:
+    return TIMING_ENABLED
+
+def observe(stage: str, seconds: float):
+    """Record one stage duration in the histograms and any active collect() on this thread"""
+    STAGE_TIMINGS.observe(stage, seconds)
+    for timings in getattr(_collectors, 'stack', ()):
+        timings.append((stage, seconds))
+
+class _StageTimer:
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe(self.name, time.perf_counter() - self.started)
+        return False
+
+def stage(name: str):
+    """Context manager timing one stage; a shared no-op while disabled"""
+    if not TIMING_ENABLED:
+        return _NO_TIMER
+    return _StageTimer(name)
+
+def timed(name: str):
+    """Decorator timing every call of a function as the named stage"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TIMING_ENABLED:
+                return func(*args, **kwargs)
+            with _StageTimer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+@contextmanager
+def collect():
+    """
+    Gather the (stage, seconds) pairs recorded on this thread inside the block,
+    e.g. to persist one evaluation's timings; yields an empty list while disabled
+    """
+    timings: List[Tuple[str, float]] = []
+    if not TIMING_ENABLED:
+        yield timings
+        return
+
+    stack = getattr(_collectors, 'stack', None)
+    if stack is None:
+        stack = _collectors.stack = []
+    stack.append(timings)
+    try:
+        yield timings
+    finally:
+        stack.pop()
@@ -0,0 +1,310 @@
+"""
+Incremental scoring for live transcripts
+Speech-recognition output arrives in chunks; IncrementalEvaluator keeps
+running rubric state so each update only processes the new text instead of
+rescoring the whole transcript. Snapshots have the same shape as
+evaluate_transcript() and use the same rubric bands.
+"""
+import re
+from typing import Optional
+
+from clarity_scoring import FILLER_END, get_filler_trie, score_clarity_from_counts
+from content_scoring import (
+    FLOW_PATTERNS, FLOW_SALUTATION_SCANNER, FLOW_SALUTATION_WINDOW, FLOW_SCANNER,
+    GOOD_TO_HAVE_PATTERNS, GOOD_TO_HAVE_SCANNER, MUST_HAVE_PATTERNS, MUST_HAVE_SCANNER,
+    score_flow_elements, score_keywords_found, score_salutation
+)
+from engagement_scoring import analyze_sentiment, score_engagement_from_sentiment
+from evaluation import combine_scores
+from language_grammar_scoring import (
+    FRAGMENT_EXCEPTIONS, SUBJECT_VERB_PATTERNS, score_grammar_from_errors, score_vocabulary_from_counts
+)
+from speech_rate_scoring import score_speech_rate
+from transcript_analysis import OPENING_WORD_LIMIT, SENTENCE_BOUNDARY_PATTERN, TOKEN_PATTERN
+
+# Characters of already processed text rescanned with each chunk, so keyword
+# and grammar patterns that straddle a chunk boundary are still found
+CONTEXT_WINDOW = 200
+
+SPACE_RUN_PATTERN = re.compile(r' +')
+WHITESPACE_PATTERN = re.compile(r'\s')
+
+# count_grammar_errors: a run of 3+ spaces, counted once more than 3 runs are seen
+MULTIPLE_SPACE_RUN = 3
+
+def pending_engagement() -> dict:
+    """Engagement before a snapshot has computed it; no points, so totals leave it out"""
+    return {
+        'sentiment': 0,
+        'total': 0,
+        'feedback': "Engagement: pending - scored when the transcript is finished",
+        'metrics': {
+            'sentiment_score': None,
+            'sentiment_level': None,
+            'fallback': False,
+            'pending': True
+        }
+    }
+
+class IncrementalEvaluator:
+    """
+    Running rubric state for one live transcript
+
+    feed() commits text up to the last whitespace in the stream; the word
+    being spoken at the end of a chunk is held back until the next chunk (or
+    finish()) shows it is complete. Keyword patterns are matched within
+    CONTEXT_WINDOW characters of each chunk. Sentiment has no incremental
+    form, so engagement is only recomputed when a snapshot asks for it.
+    """
+
+    def __init__(self, context_window: int = CONTEXT_WINDOW):
+        self.context_window = context_window
+        self.elapsed_seconds = 0
+        self.chunks = 0
+
+        self._parts = []
+        self._pending = ''
+        self._committed_chars = 0
+        self._context = ''
+
+        # Vocabulary and fillers
+        self._token_count = 0
+        self._distinct = set()
+        self._filler_trie = get_filler_trie()
+        self._filler_matches = []
+        self._filler_counts = {}
+        self._gap_is_space = True
+
+        # Content detections: category -> offset in the lowered stream
+        self._opening = ''
+        self._opening_done = False
+        self._head = ''
+        self._must_have = {}
+        self._good_to_have = {}
+        self._flow = {}
+
+        # Grammar
+        self._subject_verb = set()
+        self._space_run = 0
+        self._space_runs = 0
+        self._fragments = 0
+        self._sentence_words = 0
+        self._sentence_first = ''
+
+        self._engagement = None
+        self._engagement_tokens = None
+
+    @property
+    def text(self) -> str:
+        """Everything received so far, including a held-back partial word"""
+        return ''.join(self._parts) + self._pending
+
+    def feed(self, chunk: str, elapsed_seconds: Optional[float] = None) -> dict:
+        """Add a chunk of transcript text and return an updated snapshot"""
+        self.chunks += 1
+        if elapsed_seconds is not None:
+            self.elapsed_seconds = elapsed_seconds
+
+        # Split at the last whitespace in this chunk; the rest waits for more text
+        cut = None
+        for match in WHITESPACE_PATTERN.finditer(chunk):
+            cut = match.end()
+        if cut is None:
+            self._pending += chunk
+        else:
+            segment = self._pending + chunk[:cut]
+            self._pending = chunk[cut:]
+            self._commit(segment)
+        return self.snapshot()
+
+    def finish(self, elapsed_seconds: Optional[float] = None) -> dict:
+        """Commit any held-back text and return the final snapshot, including engagement"""
+        if elapsed_seconds is not None:
+            self.elapsed_seconds = elapsed_seconds
+        if self._pending:
+            segment, self._pending = self._pending, ''
+            self._commit(segment)
+        return self.snapshot(include_engagement=True)
+
+    def _commit(self, segment: str):
+        self._parts.append(segment)
+        segment_lower = segment.lower()
+
+        self._count_tokens(segment)
+        self._track_grammar(segment)
+        self._detect_content(segment_lower)
+
+        self._committed_chars += len(segment_lower)
+        context = (self._context + segment_lower)[-self.context_window:]
+        # Start the carried context on a word boundary so \b behaves as in the full text
+        space = WHITESPACE_PATTERN.search(context)
+        self._context = context[space.end():] if space and len(context) == self.context_window else context
+
+    def _count_tokens(self, segment: str):
+        trie = self._filler_trie
+        previous_end = 0
+        gap_is_space = self._gap_is_space
+
+        for match in TOKEN_PATTERN.finditer(segment):
+            start, end = match.span()
+            token = match.group().lower()
+            self._token_count += 1
+            self._distinct.add(token)
+
+            gap_is_space = gap_is_space and (start == previous_end or segment[previous_end:start].isspace())
+
+            # Multi-word fillers continue only across whitespace, as in find_filler_words
+            matches = []
+            candidates = [trie]
+            if gap_is_space:
+                candidates.extend(self._filler_matches)
+            for node in candidates:
+                child = node.get(token)
+                if child is None:
+                    continue
+                filler = child.get(FILLER_END)
+                if filler is not None:
+                    self._filler_counts[filler] = self._filler_counts.get(filler, 0) + 1
+                if len(child) > (filler is not None):
+                    matches.append(child)
+            self._filler_matches = matches
+
+            previous_end = end
+            gap_is_space = True
+
+        self._gap_is_space = gap_is_space and (previous_end == len(segment)
+                                               or segment[previous_end:].isspace())
+
+    def _track_grammar(self, segment: str):
+        # Runs of 3+ spaces, joined across chunk boundaries
+        for match in SPACE_RUN_PATTERN.finditer(segment):
+            before = self._space_run if match.start() == 0 else 0
+            run = before + match.end() - match.start()
+            if before < MULTIPLE_SPACE_RUN <= run:
+                self._space_runs += 1
+            self._space_run = run
+        if not segment.endswith(' '):
+            self._space_run = 0
+
+        # One-word sentences; only the word count (capped at 2) and first word are kept
+        pieces = SENTENCE_BOUNDARY_PATTERN.split(segment)
+        for index, piece in enumerate(pieces):
+            if index:
+                self._close_sentence()
+            if self._sentence_words < 2:
+                words = piece.split(maxsplit=2)[:2]
+                if words and self._sentence_words == 0:
+                    self._sentence_first = words[0]
+                self._sentence_words += len(words)
+
+    def _close_sentence(self):
+        self._fragments += self._is_fragment()
+        self._sentence_words = 0
+        self._sentence_first = ''
+
+    def _is_fragment(self) -> bool:
+        return self._sentence_words == 1 and self._sentence_first.lower() not in FRAGMENT_EXCEPTIONS
+
+    def _detect_content(self, segment_lower: str):
+        if not self._opening_done:
+            words = (self._opening + segment_lower).split(maxsplit=OPENING_WORD_LIMIT)
+            self._opening_done = len(words) > OPENING_WORD_LIMIT
+            self._opening = ' '.join(words[:OPENING_WORD_LIMIT]) + ' '
+
+        if len(self._head) < FLOW_SALUTATION_WINDOW:
+            self._head = (self._head + segment_lower)[:FLOW_SALUTATION_WINDOW]
+            if 'salutation' not in self._flow:
+                self._flow.update(FLOW_SALUTATION_SCANNER.scan(self._head))
+
+        window = self._context + segment_lower
+        offset = self._committed_chars - len(self._context)
+        for scanner, found in ((MUST_HAVE_SCANNER, self._must_have),
+                               (GOOD_TO_HAVE_SCANNER, self._good_to_have),
+                               (FLOW_SCANNER, self._flow)):
+            for category, pattern in scanner.patterns.items():
+                if category not in found:
+                    match = pattern.search(window)
+                    if match:
+                        found[category] = offset + match.start()
+
+        for pattern in SUBJECT_VERB_PATTERNS:
+            if pattern not in self._subject_verb and pattern.search(window):
+                self._subject_verb.add(pattern)
+
+    def grammar_errors(self) -> int:
+        """Same estimate as count_grammar_errors() over the committed text"""
+        errors = len(self._subject_verb)
+        if self._space_runs > 3:
+            errors += 1
+        if self._fragments + self._is_fragment() > 2:
+            errors += 1
+        return min(errors, 3)
+
+    def snapshot(self, include_engagement: bool = False) -> dict:
+        """
+        Current scores in the evaluate_transcript() format, plus a 'stream' entry
+        Engagement is rescored over the full text only when include_engagement
+        is set; otherwise the last computed result is reused. Until it is first
+        computed, engagement is pending: it scores 0 points (so the interim total
+        leaves it out) and stream['engagement_pending'] is True
+        """
+        if include_engagement:
+            self._engagement = score_engagement_from_sentiment(analyze_sentiment(''.join(self._parts)))
+            self._engagement_tokens = self._token_count
+        engagement = self._engagement if self._engagement is not None else pending_engagement()
+
+        salutation_score, salutation_feedback = score_salutation(self._opening)
+        keyword_score, keyword_feedback = score_keywords_found(
+            [category for category in MUST_HAVE_PATTERNS if category in self._must_have],
+            [category for category in GOOD_TO_HAVE_PATTERNS if category in self._good_to_have]
+        )
+        flow_score, flow_feedback = score_flow_elements(
+            sum(element in self._flow for element in FLOW_PATTERNS)
+        )
+        content_scores = {
+            'salutation': salutation_score,
+            'keyword_presence': keyword_score,
+            'flow': flow_score,
+            'total': salutation_score + keyword_score + flow_score,
+            'feedback': {
+                'salutation': salutation_feedback,
+                'keywords': keyword_feedback,
+                'flow': flow_feedback
+            }
+        }
+
+        grammar_result = score_grammar_from_errors(self.grammar_errors(), self._token_count)
+        vocabulary_result = score_vocabulary_from_counts(len(self._distinct), self._token_count)
+        language_scores = {
+            'grammar': grammar_result['grammar'],
+            'vocabulary': vocabulary_result['vocabulary'],
+            'total': grammar_result['grammar'] + vocabulary_result['vocabulary'],
+            'feedback': {
+                'grammar': grammar_result['feedback'],
+                'vocabulary': vocabulary_result['feedback']
+            },
+            'metrics': {
+                'grammar': grammar_result['metrics'],
+                'vocabulary': vocabulary_result['metrics']
+            }
+        }
+
+        filler_count = sum(self._filler_counts.values())
+        evaluation = combine_scores(
+            content_scores,
+            score_speech_rate(self._token_count, self.elapsed_seconds),
+            language_scores,
+            score_clarity_from_counts(filler_count, self._token_count),
+            engagement
+        )
+        evaluation['stream'] = {
+            'chunks': self.chunks,
+            'committed_chars': self._committed_chars,
+            'pending_chars': len(self._pending),
+            'elapsed_seconds': self.elapsed_seconds,
+            'word_count': self._token_count,
+            'filler_counts': dict(self._filler_counts),
+            'engagement_pending': self._engagement is None,
+            'engagement_word_count': self._engagement_tokens
+        }
+        return evaluation
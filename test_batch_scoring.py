@@ -0,0 +1,58 @@
+"""
+Regression tests for batch scoring input handling
+The same submission must score the same whether it comes from CSV (numbers as
+text) or JSONL (numbers as JSON ints or floats), and malformed JSONL lines are
+reported as row errors.
+
+Usage:
+    python -m pytest test_batch_scoring.py
+"""
+import csv
+import json
+import warnings
+
+import pytest
+
+from batch_scoring import read_rows, score_row
+
+TRANSCRIPT = ("Hello everyone, myself Muskan. I am 13 years old and I study in class 8. "
+              "In my free time I like to play badminton. Thank you for listening.")
+
+def _score(path):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return [score_row(number, row) for number, row in enumerate(read_rows(str(path)), 1)]
+
+@pytest.mark.parametrize('word_count', [28, 28.0, '28', '28.0'])
+def test_whole_numbers_score_alike_in_csv_and_jsonl(tmp_path, word_count):
+    row = {'student_name': "Muskan", 'transcript': TRANSCRIPT, 'word_count': word_count,
+           'sentence_count': 4, 'duration_seconds': 12.0}
+
+    jsonl_path = tmp_path / 'input.jsonl'
+    jsonl_path.write_text(json.dumps(row) + '\n')
+    csv_path = tmp_path / 'input.csv'
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(row))
+        writer.writeheader()
+        writer.writerow(row)
+
+    [jsonl_result] = _score(jsonl_path)
+    [csv_result] = _score(csv_path)
+    assert jsonl_result['error'] is None
+    assert csv_result['error'] is None
+    assert jsonl_result['scores'] == csv_result['scores']
+
+def test_fractional_word_count_is_rejected(tmp_path):
+    path = tmp_path / 'input.jsonl'
+    path.write_text(json.dumps({'student_name': "Muskan", 'transcript': TRANSCRIPT, 'word_count': 28.5,
+                                'sentence_count': 4, 'duration_seconds': 12}) + '\n')
+    [result] = _score(path)
+    assert result['error'] is not None
+
+def test_malformed_jsonl_lines_are_row_errors(tmp_path):
+    path = tmp_path / 'input.jsonl'
+    path.write_text('{"student_name": "Muskan"\n[1, 2]\n')
+    results = _score(path)
+    assert [result['row'] for result in results] == [1, 2]
+    assert "line 1" in results[0]['error']
+    assert "Line 2" in results[1]['error']
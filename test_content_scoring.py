@@ -0,0 +1,43 @@
+"""
+Regression tests for the bounded content-scoring patterns
+Split keywords match only within KEYWORD_GAP (80 characters, same sentence),
+and the age pattern only starts at the first digit of a run, which keeps
+every scan linear (see benchmarks/bench_adversarial.py).
+
+Usage:
+    python -m pytest test_content_scoring.py
+"""
+import pytest
+
+from content_scoring import FLOW_SCANNER, MUST_HAVE_SCANNER, extract_keywords
+
+def _gap(length):
+    # Filler that none of the keyword patterns match
+    return 'z' * length
+
+@pytest.mark.parametrize('first, last, group, category', [
+    ("in my free time", "read", 'must_have', 'hobbies'),
+    ("my career", "plan", 'good_to_have', 'goal'),
+])
+def test_split_keyword_gap_limit(first, last, group, category):
+    assert category in extract_keywords(f"{first}{_gap(80)}{last}")[group]
+    assert category not in extract_keywords(f"{first}{_gap(81)}{last}")[group]
+
+def test_split_keyword_same_sentence():
+    assert 'hobbies' in extract_keywords("in my free time, i read")['must_have']
+    for boundary in '.!?\n':
+        assert 'hobbies' not in extract_keywords(f"in my free time{boundary} i read")['must_have']
+
+def test_flow_details_gap_limit():
+    assert 'details' in FLOW_SCANNER.scan(f"year{_gap(80)}old")
+    assert 'details' not in FLOW_SCANNER.scan(f"year{_gap(81)}old")
+    assert 'details' not in FLOW_SCANNER.scan("one year. old")
+
+def test_age_starts_at_first_digit():
+    age = MUST_HAVE_SCANNER.patterns['age']
+    text = "she is 1234 years old"
+    assert age.search(text).start() == text.index('1')
+    # Not entered from inside a digit run, even when the search starts there
+    assert age.search(text, text.index('2')) is None
+    assert 'age' in extract_keywords("i turned 13 years old")['must_have']
+    assert 'age' not in extract_keywords('7' * 5000 + " apples")['must_have']
@@ -0,0 +1,75 @@
+"""
+Regression test for selective recomputation of stored scores
+Recomputing the outdated criteria of a stored score in place must leave it
+equal to a fresh evaluate_transcript() of the same transcript.
+
+Usage:
+    python -m pytest test_rescoring.py
+"""
+import warnings
+
+import pytest
+
+import database
+import evaluation
+from rescoring import recompute_stale
+
+TRANSCRIPTS = [
+    ("Muskan", "Hello everyone, myself Muskan. I am 13 years old and I study in class 8 "
+               "at Christ Public School. There are four people in my family. In my free time "
+               "I like to play badminton. I want to become a doctor. Thank you for listening.", 52),
+    ("Ravi", "Hi, um, my name is Ravi, I am like 12 years old. I study in class 7. "
+             "I enjoy reading books and, you know, my career goal is to be a pilot. Thanks.", 30),
+    ("Asha", "Good morning. Myself Asha. I has a dog. Dog. My hobby is painting. Bye.", 0),
+]
+
+# Criteria recomputed without the sentiment lexicon, which may be missing here
+RECOMPUTED = ['salutation', 'keyword_presence', 'flow', 'speech_rate', 'grammar', 'vocabulary', 'filler_words']
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    database.close_connections()
+    monkeypatch.setattr(database, 'DB_PATH', tmp_path / 'scores.db')
+    database.init_db()
+    yield
+    database.close_connections()
+
+def _evaluate(transcript, duration_seconds):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return evaluation.evaluate_transcript(transcript, len(transcript.split()), duration_seconds)
+
+def test_recompute_matches_full_evaluation(db, monkeypatch):
+    rows = []
+    for student_name, transcript, duration_seconds in TRANSCRIPTS:
+        result = _evaluate(transcript, duration_seconds)
+        # Store the scores an older scorer version would have produced
+        scores = dict(result['scores'], **{criterion: 0 for criterion in RECOMPUTED})
+        feedback = {section: ('outdated' if isinstance(value, str) else dict.fromkeys(value, 'outdated'))
+                    for section, value in result['feedback'].items()}
+        feedback['engagement'] = result['feedback']['engagement']
+        rows.append({
+            'student_name': student_name, 'transcript': transcript,
+            'word_count': len(transcript.split()), 'sentence_count': 0,
+            'duration_seconds': duration_seconds, 'scores': scores, 'feedback': feedback,
+        })
+    transcript_ids = database.save_evaluations_many(rows)
+
+    for criterion in RECOMPUTED:
+        monkeypatch.setitem(evaluation.CRITERION_VERSIONS, criterion,
+                            evaluation.CRITERION_VERSIONS[criterion] + '-next')
+    assert database.count_stale_scores() == len(TRANSCRIPTS)
+
+    summary = recompute_stale(workers=1, batch_size=2, progress=lambda message: None)
+    assert summary['updated'] == len(TRANSCRIPTS)
+    assert summary['failed'] == 0
+    assert database.count_stale_scores() == 0
+
+    for transcript_id, (_, transcript, duration_seconds) in zip(transcript_ids, TRANSCRIPTS):
+        stored = database.get_transcript_details(transcript_id)
+        expected = _evaluate(transcript, duration_seconds)
+        assert stored['scores'] == expected['scores']
+        assert stored['feedback'] == expected['feedback']
+        for name, value in evaluation.extract_metrics(expected).items():
+            if name != 'sentiment_score':
+                assert stored['metrics'][name] == pytest.approx(value)
@@ -0,0 +1,81 @@
+"""
+Tests for the HTTP scoring service
+Runs the service on an event loop in a background thread with one pool
+worker, and talks to it over HTTP like a client would.
+
+Usage:
+    python -m pytest test_scoring_service.py
+"""
+import asyncio
+import json
+import os
+import signal
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from scoring_service import ScoringService
+
+SUBMISSION = {
+    'student_name': "Muskan",
+    'transcript': "Hello everyone, myself Muskan. I am 13 years old and I study in class 8. "
+                  "In my free time I like to play badminton. Thank you for listening.",
+    'word_count': 28,
+    'sentence_count': 4,
+    'duration_seconds': 12,
+}
+
+@pytest.fixture
+def service():
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    scoring_service = ScoringService(workers=1)
+    server = asyncio.run_coroutine_threadsafe(scoring_service.start('127.0.0.1', 0), loop).result()
+    port = server.sockets[0].getsockname()[1]
+    yield scoring_service, f'http://127.0.0.1:{port}'
+    asyncio.run_coroutine_threadsafe(scoring_service.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+
+def _request(url, payload=None):
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    request = urllib.request.Request(url, data=data, method='POST' if data is not None else 'GET')
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+def test_score(service):
+    _, url = service
+    status, body = _request(url + '/score', SUBMISSION)
+    assert status == 200
+    assert set(body) == {'scores', 'feedback'}
+    assert 0 <= body['scores']['total'] <= 100
+
+def test_score_validation_error(service):
+    _, url = service
+    status, body = _request(url + '/score', dict(SUBMISSION, transcript=""))
+    assert status == 422
+    assert body['error']
+
+def test_recovers_after_worker_crash(service):
+    scoring_service, url = service
+    assert _request(url + '/score', SUBMISSION)[0] == 200
+
+    worker_pid = scoring_service.executor.submit(os.getpid).result()
+    os.kill(worker_pid, signal.SIGKILL)
+
+    status, health = _request(url + '/health')
+    assert status == 503
+    assert health['status'] == 'pool_broken'
+    assert health['pool_restarts'] == 1
+
+    status, health = _request(url + '/health')
+    assert status == 200
+    assert health['status'] == 'ok'
+    assert _request(url + '/score', SUBMISSION)[0] == 200
@@ -0,0 +1,57 @@
+"""
+Regression tests for full-text search with the View Results filters
+Student and date filters restrict the matches before paging, in both orders.
+
+Usage:
+    python -m pytest test_search.py
+"""
+from datetime import date, timedelta
+
+import pytest
+
+import database
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    database.close_connections()
+    monkeypatch.setattr(database, 'DB_PATH', tmp_path / 'scores.db')
+    database.init_db()
+    yield
+    database.close_connections()
+
+def _save(student_names):
+    return database.save_evaluations_many([
+        {'student_name': name, 'transcript': f"I play cricket with my friends, says {name}",
+         'word_count': 7, 'sentence_count': 1, 'duration_seconds': 5,
+         'scores': {'total': 50}, 'feedback': {}}
+        for name in student_names
+    ])
+
+def _all_pages(text, order, **filters):
+    ids = []
+    cursor = None
+    while True:
+        page = database.search_transcripts(text, 3, cursor=cursor, order=order, **filters)
+        ids.extend(row[0] for row in page['rows'])
+        cursor = page['next_cursor']
+        if cursor is None:
+            return ids
+
+@pytest.mark.parametrize('order', ['rank', 'newest'])
+def test_search_applies_student_filter(db, order):
+    transcript_ids = _save(['Ravi', 'Asha'] * 5)
+    ravi_ids = {transcript_id for transcript_id, name in zip(transcript_ids, ['Ravi', 'Asha'] * 5) if name == 'Ravi'}
+
+    assert set(_all_pages('cricket', order)) == set(transcript_ids)
+    found = _all_pages('cricket', order, student_name='Ravi')
+    assert sorted(found) == sorted(ravi_ids)
+
+@pytest.mark.parametrize('order', ['rank', 'newest'])
+def test_search_applies_date_filter(db, order):
+    transcript_ids = _save(['Ravi', 'Asha'])
+    today = date.today()
+    # created_at is UTC, so "today" is checked with a day of margin on each side
+    assert sorted(_all_pages('cricket', order, date_from=today - timedelta(days=1),
+                             date_to=today + timedelta(days=1))) == sorted(transcript_ids)
+    assert _all_pages('cricket', order, date_to=today - timedelta(days=2)) == []
+    assert _all_pages('cricket', order, date_from=today + timedelta(days=2)) == []
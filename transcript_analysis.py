@@ -0,0 +1,77 @@
+"""
+Shared transcript analysis
+Tokenizes a transcript once per evaluation so every scorer reuses the same pass
+"""
+import re
+from dataclasses import dataclass
+from typing import Tuple, Union
+
+TOKEN_PATTERN = re.compile(r'\b\w+\b')
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'[.!?]+')
+OPENING_WORD_LIMIT = 50
+
+@dataclass(frozen=True)
+class AnalyzedTranscript:
+    """
+    Pre-computed view of a transcript
+    tokens are lowercased; token_spans and sentence_spans index into text
+    """
+    text: str
+    text_lower: str
+    tokens: Tuple[str, ...]
+    token_spans: Tuple[Tuple[int, int], ...]
+    sentence_spans: Tuple[Tuple[int, int], ...]
+    opening_text: str
+    distinct_word_count: int
+
+    @property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def sentences(self) -> Tuple[str, ...]:
+        return tuple(self.text[start:end] for start, end in self.sentence_spans)
+
+def analyze_transcript(transcript: str) -> AnalyzedTranscript:
+    """Tokenize a transcript once: lowered text, tokens with offsets and sentence boundaries"""
+    text_lower = transcript.lower()
+
+    tokens = []
+    token_spans = []
+    for match in TOKEN_PATTERN.finditer(transcript):
+        tokens.append(match.group().lower())
+        token_spans.append(match.span())
+
+    # Same boundaries as re.split(r'[.!?]+', transcript), including empty pieces
+    sentence_spans = []
+    start = 0
+    for match in SENTENCE_BOUNDARY_PATTERN.finditer(transcript):
+        sentence_spans.append((start, match.start()))
+        start = match.end()
+    sentence_spans.append((start, len(transcript)))
+
+    opening_text = ' '.join(text_lower.split(maxsplit=OPENING_WORD_LIMIT)[:OPENING_WORD_LIMIT])
+
+    return AnalyzedTranscript(
+        text=transcript,
+        text_lower=text_lower,
+        tokens=tuple(tokens),
+        token_spans=tuple(token_spans),
+        sentence_spans=tuple(sentence_spans),
+        opening_text=opening_text,
+        distinct_word_count=len(set(tokens))
+    )
+
+TranscriptInput = Union[str, AnalyzedTranscript]
+
+def ensure_analyzed(transcript: TranscriptInput) -> AnalyzedTranscript:
+    """Accept either raw text or an existing analysis"""
+    if isinstance(transcript, AnalyzedTranscript):
+        return transcript
+    return analyze_transcript(transcript)
+
+def transcript_text(transcript: TranscriptInput) -> str:
+    """Raw text of either input form, without analyzing plain strings"""
+    if isinstance(transcript, AnalyzedTranscript):
+        return transcript.text
+    return transcript
@@ -3,6 +3,9 @@ Input validation and sanitization module
 Ensures robustness and prevents edge case failures
 """
 
+MIN_TRANSCRIPT_LENGTH = 10
+MAX_TRANSCRIPT_LENGTH = 50000
+
 def validate_transcript(transcript: str) -> tuple:
     """
     Validate transcript input
@@ -11,10 +14,10 @@ def validate_transcript(transcript: str) -> tuple:
     if not transcript or not isinstance(transcript, str):
         return False, "Transcript must be a non-empty string"
     
-    if len(transcript.strip()) < 10:
+    if len(transcript.strip()) < MIN_TRANSCRIPT_LENGTH:
         return False, "Transcript too short (minimum 10 characters)"
     
-    if len(transcript) > 50000:
+    if len(transcript) > MAX_TRANSCRIPT_LENGTH:
         return False, "Transcript too long (maximum 50,000 characters)"
     
     return True, ""
@@ -91,3 +94,23 @@ def sanitize_transcript(transcript: str) -> str:
     lines = transcript.split('\n')
     cleaned_lines = [line.strip() for line in lines if line.strip()]
     return '\n'.join(cleaned_lines)
+
+def validate_submission(student_name: str, transcript: str, duration: int,
+                        word_count: int, sentence_count: int) -> tuple:
+    """
+    Validate every field of an evaluation request, in form order
+    Returns: (is_valid, error_message) where the message names the failing field
+    """
+    checks = [
+        ("Student Name", validate_student_name(student_name)),
+        ("Transcript", validate_transcript(transcript)),
+        ("Duration", validate_duration(duration)),
+        ("Word Count", validate_word_count(word_count)),
+        ("Sentence Count", validate_sentence_count(sentence_count))
+    ]
+    
+    for label, (is_valid, error_message) in checks:
+        if not is_valid:
+            return False, f"{label}: {error_message}"
+    
+    return True, ""